@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Link Tool Memory Benchmark
+Measures the memory held by per-link results on a synthetic aggregated corpus
+(see generate_doc_corpus.py), comparing the interned record tables with the
+equivalent dict-per-link representation the tools used before.
+
+Reported per tool:
+- peak: tracemalloc peak while the tool runs
+- records: memory retained by the results after the run
+- dicts: memory the same results take as one dict per link
+"""
+
+import contextlib
+import gc
+import os
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Tuple
+
+import fix_broken_links
+from generate_doc_corpus import generate_corpus
+from link_records import LinkTables
+from validate_links import LinkChecker
+
+
+def fresh(value: str) -> str:
+    """A new string object, as a regex match group would have produced."""
+    return value.encode('utf-8').decode('utf-8')
+
+
+def measure(build: Callable[[], object]) -> Tuple[object, int, int]:
+    """(result, retained bytes, peak bytes) of build()."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak
+
+
+def bench_validator(root: Path):
+    _, _, peak = measure(lambda: LinkChecker(root).check())
+
+    # Warm the file list and target-existence cache so only the results are retained
+    checker = LinkChecker(root)
+    checker.check()
+    checker.tables = LinkTables()
+    report, records, _ = measure(checker.check)
+
+    def as_dicts():
+        return [{'file': fresh(f.file), 'links': f.links, 'valid': f.valid,
+                 'broken_list': [{'file': fresh(link.file), 'link_text': fresh(link.link_text),
+                                  'link_url': fresh(link.link_url)} for link in f.broken_list]}
+                for f in report.files]
+    _, dicts, _ = measure(as_dicts)
+    return report.broken_count, peak, records, dicts
+
+
+def bench_repair(root: Path):
+    # Progress output goes to devnull, not a buffer that would be traced
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        warm = fix_broken_links.RepairRun(root)
+        fix_broken_links.build_file_cache(warm)
+
+    def run():
+        repair = fix_broken_links.RepairRun(root, file_cache=warm.file_cache)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            fix_broken_links.process_all_files(repair, dry_run=True)
+        return repair.log
+    log, records, peak = measure(run)
+
+    paths, urls, texts = log.tables.paths, log.tables.urls, log.tables.texts
+
+    def as_dicts():
+        unfixable = []
+        for item in log.unfixable:
+            entry = {'file': fresh(paths[item.file]), 'link': fresh(urls[item.url])}
+            if item.attempted < 0:
+                entry['reason'] = fix_broken_links.NO_CANDIDATES_REASON
+            else:
+                entry['attempted_fix'] = fresh(urls[item.attempted])
+            unfixable.append(entry)
+        modified = [{'file': fresh(paths[m.file]), 'count': m.count,
+                     'fixes': [{'old': fresh(urls[f.old]), 'new': fresh(urls[f.new]), 'text': fresh(texts[f.text])}
+                               for f in log.fixes_for(m)]}
+                    for m in log.modified]
+        return unfixable, modified
+    _, dicts, _ = measure(as_dicts)
+    return len(log.fixes) + len(log.unfixable), peak, records, dicts
+
+
+def main():
+    """Main execution function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark memory held by link results')
+    parser.add_argument('--corpus', type=Path, default=None,
+                        help='Existing corpus directory (default: generate a temporary one)')
+    parser.add_argument('--repos', type=int, default=20, help='Repositories to generate')
+    parser.add_argument('--docs', type=int, default=100, help='Documents per repository')
+    parser.add_argument('--links', type=int, default=20, help='Links per document')
+    parser.add_argument('--skip-repair', action='store_true', help='Only benchmark the validator')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.corpus or Path(tmp)
+        if args.corpus is None:
+            counts = generate_corpus(root, repos=args.repos, docs_per_repo=args.docs, links_per_doc=args.links)
+            print(f"Generated {counts['files']} files, {counts['links']} links ({counts['broken']} broken)")
+        root = root.resolve()
+
+        rows = [('validate_links', *bench_validator(root))]
+        if not args.skip_repair:
+            rows.append(('fix_broken_links', *bench_repair(root)))
+
+    mib = 1024 * 1024
+    print(f"\n{'Tool':<18} {'Results':>9} {'Peak MiB':>9} {'Records MiB':>12} {'Dicts MiB':>10} {'Saved':>6}")
+    for name, results, peak, records, dicts in rows:
+        saved = f"{(1 - records / dicts) * 100:.0f}%" if dicts else '-'
+        print(f"{name:<18} {results:>9} {peak / mib:>9.1f} {records / mib:>12.1f} {dicts / mib:>10.1f} {saved:>6}")
+
+
+if __name__ == '__main__':
+    main()
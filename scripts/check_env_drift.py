@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Environment Variable Drift Scanner
+Compares the environment variables the code reads with the ones the docs and
+.env.example describe.
+
+Sources: every `process.env.X`, `process.env['X']` and `import.meta.env.X`
+in client/, server/ and shared/ (node_modules, build output and tests are
+skipped), plus the keys in .env.example.
+Docs: variables named in docs/reference/config/ENVIRONMENT.md (table rows,
+`X=` assignments and backticked names), or the files passed with --doc.
+
+Reports:
+- Undocumented variables (used in code or .env.example, absent from docs)
+- Documented-but-unused variables (not read anywhere in code)
+- VITE_-prefixed secrets (VITE_ variables are bundled into the browser)
+
+The source scan runs on a process pool and per-file results are cached by
+content hash in .cache/doc-tools/env.json.
+
+Exit codes:
+- 0: No drift detected
+- 1: Drift or exposed secrets detected
+"""
+
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from source_index import SourceIndexCache, iter_source_files
+from validate_links import BASE_DIR
+
+CACHE_VERSION = 1
+
+SOURCE_DIRS = ('client', 'server', 'shared')
+SOURCE_SUFFIXES = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs')
+EXCLUDED_DIRS = ('node_modules', 'dist', 'build', 'coverage', '__tests__', 'tests', 'test')
+EXCLUDED_SUFFIXES = ('.d.ts', '.test.ts', '.test.tsx', '.spec.ts', '.spec.tsx',
+                     '.test.js', '.spec.js')
+DEFAULT_DOCS = (Path('docs') / 'reference' / 'config' / 'ENVIRONMENT.md',)
+
+ENV_USAGE_PATTERN = re.compile(
+    r"(?:process\.env|import\.meta\.env)"
+    r"(?:\.([A-Z][A-Z0-9_]*)|\[\s*['\"]([A-Z][A-Z0-9_]*)['\"]\s*\])")
+ENV_EXAMPLE_PATTERN = re.compile(r"^\s*(?:export\s+)?([A-Z][A-Z0-9_]*)\s*=", re.MULTILINE)
+
+DOC_TABLE_PATTERN = re.compile(r"^\|\s*`?([A-Z][A-Z0-9_]*)`?\s*\|", re.MULTILINE)
+DOC_ASSIGN_PATTERN = re.compile(r"^\s*(?:export\s+)?([A-Z][A-Z0-9]*(?:_[A-Z0-9]+)+)=", re.MULTILINE)
+DOC_CODE_PATTERN = re.compile(r"`([A-Z][A-Z0-9]*(?:_[A-Z0-9]+)+)`")
+
+# Set by Vite itself, never configured by us
+VITE_BUILTINS = {'DEV', 'PROD', 'MODE', 'SSR', 'BASE_URL'}
+
+SECRET_PATTERN = re.compile(r"(SECRET|PASSWORD|PRIVATE|TOKEN|API_KEY|SERVICE_KEY|PEPPER)")
+# Keys designed to be public in the browser
+PUBLIC_KEY_PATTERN = re.compile(r"(ANON_KEY|PUBLISHABLE|PUBLIC)")
+
+
+def extract_env_usages(text: str) -> Dict[str, int]:
+    """Variable name -> number of reads in one source file."""
+    counts: Dict[str, int] = defaultdict(int)
+    for match in ENV_USAGE_PATTERN.finditer(text):
+        counts[match.group(1) or match.group(2)] += 1
+    return dict(counts)
+
+
+def extract_documented(text: str) -> Set[str]:
+    names = set(DOC_TABLE_PATTERN.findall(text))
+    names.update(DOC_ASSIGN_PATTERN.findall(text))
+    names.update(DOC_CODE_PATTERN.findall(text))
+    return names
+
+
+def is_exposed_secret(name: str) -> bool:
+    return (name.startswith('VITE_') and bool(SECRET_PATTERN.search(name))
+            and not PUBLIC_KEY_PATTERN.search(name))
+
+
+def find_source_files(root: Path) -> List[Path]:
+    files = []
+    for directory in SOURCE_DIRS:
+        if (root / directory).is_dir():
+            files.extend(iter_source_files(root / directory, SOURCE_SUFFIXES,
+                                           exclude=EXCLUDED_DIRS, exclude_suffixes=EXCLUDED_SUFFIXES))
+    return files
+
+
+def scan_code(root: Path, use_cache: bool = True, workers: Optional[int] = None) -> Dict[str, List[str]]:
+    """Variable name -> relative paths of the source files that read it."""
+    cache = SourceIndexCache('env', CACHE_VERSION, root, enabled=use_cache)
+    results = cache.map(find_source_files(root), extract_env_usages, workers=workers)
+    cache.save()
+
+    usages: Dict[str, List[str]] = defaultdict(list)
+    for path, counts in sorted(results.items()):
+        rel = str(path.relative_to(root))
+        for name in counts:
+            if name not in VITE_BUILTINS:
+                usages[name].append(rel)
+    return dict(usages)
+
+
+def read_env_example(root: Path) -> Set[str]:
+    try:
+        return set(ENV_EXAMPLE_PATTERN.findall((root / '.env.example').read_text(encoding='utf-8')))
+    except OSError:
+        return set()
+
+
+def read_documented(root: Path, docs: Iterable[Path]) -> Dict[str, List[str]]:
+    documented: Dict[str, List[str]] = defaultdict(list)
+    for doc in docs:
+        path = doc if doc.is_absolute() else root / doc
+        try:
+            text = path.read_text(encoding='utf-8')
+        except OSError:
+            print(f"  ⚠️  File not found: {doc}")
+            continue
+        for name in extract_documented(text):
+            documented[name].append(str(path.relative_to(root)))
+    return dict(documented)
+
+
+def compare(code: Dict[str, List[str]], example: Set[str], documented: Dict[str, List[str]]) -> Dict:
+    """Drift between code, .env.example and docs."""
+    known = set(code) | example
+
+    def sources(name):
+        return code.get(name, []) + (['.env.example'] if name in example else [])
+
+    return {
+        'undocumented': [
+            {'name': name, 'sources': sources(name)}
+            for name in sorted(known - set(documented))
+        ],
+        'unused': [
+            {'name': name, 'docs': documented[name], 'in_env_example': name in example}
+            for name in sorted(set(documented) - set(code))
+        ],
+        'exposed_secrets': [
+            {'name': name, 'where': sources(name) + documented.get(name, [])}
+            for name in sorted(known | set(documented))
+            if is_exposed_secret(name)
+        ],
+    }
+
+
+def main():
+    """Main execution function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Diff environment variables in code against the docs')
+    parser.add_argument('--root', type=Path, default=BASE_DIR, help='Repository root')
+    parser.add_argument('--doc', dest='docs', type=Path, action='append', default=None,
+                        help='Markdown file documenting variables (repeatable; default: ENVIRONMENT.md)')
+    parser.add_argument('--workers', type=int, default=None, help='Scan processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not write the scan cache')
+    parser.add_argument('--json', dest='json_path', type=Path, default=None,
+                        help='Also write the findings as JSON')
+    args = parser.parse_args()
+
+    root = args.root.resolve()
+
+    print("=" * 80)
+    print("Environment Variable Drift Check")
+    print("=" * 80)
+
+    code = scan_code(root, use_cache=not args.no_cache, workers=args.workers)
+    example = read_env_example(root)
+    documented = read_documented(root, args.docs or DEFAULT_DOCS)
+    print(f"Code reads {len(code)} variables, .env.example defines {len(example)}, "
+          f"docs describe {len(documented)}")
+
+    findings = compare(code, example, documented)
+
+    if args.json_path:
+        args.json_path.write_text(json.dumps(findings, indent=2), encoding='utf-8')
+        print(f"Findings written to: {args.json_path}")
+
+    if findings['undocumented']:
+        print(f"\n⚠️  UNDOCUMENTED VARIABLES ({len(findings['undocumented'])}):")
+        for item in findings['undocumented']:
+            sources = item['sources']
+            more = f" (+{len(sources) - 3} more)" if len(sources) > 3 else ""
+            print(f"   {item['name']}: {', '.join(sources[:3])}{more}")
+
+    if findings['unused']:
+        print(f"\n⚠️  DOCUMENTED BUT UNUSED ({len(findings['unused'])}):")
+        for item in findings['unused']:
+            note = " (still in .env.example)" if item['in_env_example'] else ""
+            print(f"   {item['name']}{note}")
+
+    if findings['exposed_secrets']:
+        print(f"\n❌ VITE_ SECRETS ({len(findings['exposed_secrets'])}) - bundled into the client:")
+        for item in findings['exposed_secrets']:
+            print(f"   {item['name']}: {', '.join(item['where'])}")
+
+    if not any(findings.values()):
+        print("\n✅ No drift detected")
+        return 0
+    return 1
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+API Route Drift Checker
+Reports API paths mentioned in the documentation that the Express server
+does not register, with nearest-match suggestions.
+
+The route table is built from server/src: `router.<verb>(...)` registrations
+are joined with their `app.use(...)` / `router.use(...)` mount prefixes,
+starting from server.ts. Per-file extraction and the final route table are
+cached by source hash in .cache/doc-tools/, so unchanged trees skip the
+TypeScript scan entirely.
+
+Exit codes:
+- 0: No drift detected
+- 1: Documented paths that do not exist
+"""
+
+import difflib
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from source_index import SourceIndexCache, iter_source_files
+from validate_links import BASE_DIR, find_markdown_files
+
+CACHE_VERSION = 1
+
+HTTP_VERBS = ('get', 'post', 'put', 'patch', 'delete', 'all')
+
+IMPORT_PATTERN = re.compile(
+    r"import\s+(?:type\s+)?(?:(\w+)\s*,?\s*)?(?:\{([^}]*)\})?\s*from\s+['\"]([^'\"]+)['\"]")
+ROUTER_DECL_PATTERN = re.compile(
+    r"\b(?:const|let|var)\s+(\w+)\s*(?::\s*[\w.]+\s*)?=\s*(?:express\s*\.\s*)?(?:Router|express)\s*\(")
+ROUTE_PATTERN = re.compile(
+    r"\b(\w+)\s*\.\s*(" + '|'.join(HTTP_VERBS) + r")\s*\(\s*(['\"`])([^'\"`]*)\3")
+MOUNT_PATTERN = re.compile(r"\b(\w+)\s*\.\s*use\s*\(\s*(['\"`])([^'\"`]*)\2\s*,([^;]*)")
+IDENT_PATTERN = re.compile(r"\b([A-Za-z_$][\w$]*)\b")
+
+# One scanner for every documented path: optional HTTP verb, then /api/...
+# The lookbehind rejects file paths such as reference/api/... but keeps
+# URLs like localhost:3001/api/...
+DOC_PATH_PATTERN = re.compile(
+    r"(?:\b(GET|POST|PUT|PATCH|DELETE)\s+)?(?:(?<=\d)|(?<![\w./-]))"
+    r"(/api(?:/(?:<\w+>|[A-Za-z0-9_:{}.*-])+)+)/?")
+
+PLACEHOLDER_PATTERN = re.compile(r"^(?::\w+\??|\{\w+\}|<\w+>|\*)$")
+
+
+def extract_route_facts(text: str) -> Dict:
+    """Imports, router variables, registrations and mounts of one TS module."""
+    imports = {}
+    for match in IMPORT_PATTERN.finditer(text):
+        default, named, spec = match.groups()
+        if default:
+            imports[default] = spec
+        for item in (named or '').split(','):
+            item = item.strip()
+            if not item:
+                continue
+            local = item.split(' as ')[-1].strip()
+            imports[local] = spec
+
+    routers = sorted(set(ROUTER_DECL_PATTERN.findall(text)))
+    routes = [[m.group(1), m.group(2).upper(), m.group(4)]
+              for m in ROUTE_PATTERN.finditer(text) if m.group(1) in routers]
+    mounts = []
+    for match in MOUNT_PATTERN.finditer(text):
+        if match.group(1) not in routers:
+            continue
+        targets = [ident for ident in IDENT_PATTERN.findall(match.group(4)) if ident in imports]
+        if targets:
+            mounts.append([match.group(3), targets])
+    return {'imports': imports, 'routes': routes, 'mounts': mounts}
+
+
+def resolve_module(source: Path, spec: str) -> Optional[Path]:
+    if not spec.startswith('.'):
+        return None
+    base = (source.parent / spec).resolve()
+    for candidate in (base.with_name(base.name + '.ts'), base / 'index.ts',
+                      base.with_name(base.name + '.js'), base / 'index.js'):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def join_path(prefix: str, path: str) -> str:
+    joined = '/' + '/'.join(part for part in (prefix + '/' + path).split('/') if part)
+    return joined
+
+
+def build_route_table(entry: Path, facts: Dict[Path, Dict]) -> List[Tuple[str, str]]:
+    """All (METHOD, full path) pairs reachable from the entry module."""
+    table = set()
+
+    def walk(module: Path, prefix: str, stack: Tuple[Path, ...]):
+        module_facts = facts.get(module)
+        if module_facts is None or module in stack:
+            return
+        for _, method, path in module_facts['routes']:
+            table.add((method, join_path(prefix, path)))
+        for mount_prefix, targets in module_facts['mounts']:
+            for ident in targets:
+                target = resolve_module(module, module_facts['imports'][ident])
+                if target is not None and target != module:
+                    walk(target, join_path(prefix, mount_prefix), stack + (module,))
+
+    walk(entry, '', ())
+    return sorted(table)
+
+
+def segments(path: str) -> List[str]:
+    return [part for part in path.split('/') if part]
+
+
+def is_placeholder(segment: str) -> bool:
+    return bool(PLACEHOLDER_PATTERN.match(segment))
+
+
+def path_matches(documented: str, route: str) -> bool:
+    """Route params match any documented segment; doc placeholders only match params."""
+    doc_parts, route_parts = segments(documented), segments(route)
+    if len(doc_parts) != len(route_parts):
+        return False
+    for doc_part, route_part in zip(doc_parts, route_parts):
+        if route_part.startswith(':') or route_part == '*':
+            continue
+        if is_placeholder(doc_part) or doc_part != route_part:
+            return False
+    return True
+
+
+def normalize_for_display(path: str) -> str:
+    return '/' + '/'.join(':param' if is_placeholder(p) else p for p in segments(path))
+
+
+class RouteIndex:
+    """Route table with a lookup keyed by segment count."""
+
+    def __init__(self, table: List[Tuple[str, str]]):
+        self.table = table
+        self.by_length: Dict[int, List[Tuple[str, str]]] = defaultdict(list)
+        for method, path in table:
+            self.by_length[len(segments(path))].append((method, path))
+        self.paths = sorted({normalize_for_display(path) for _, path in table})
+
+    def methods_for(self, documented: str) -> Optional[set]:
+        """Methods registered for a documented path, or None if no route matches."""
+        methods = {method for method, path in self.by_length.get(len(segments(documented)), ())
+                   if path_matches(documented, path)}
+        return methods or None
+
+    def suggest(self, documented: str, n: int = 3) -> List[str]:
+        return difflib.get_close_matches(normalize_for_display(documented), self.paths, n=n, cutoff=0.6)
+
+
+def load_route_index(root: Path, use_cache: bool = True) -> RouteIndex:
+    server_src = root / "server" / "src"
+    entry = server_src / "server.ts"
+    sources = [entry] + iter_source_files(server_src / "routes", ('.ts',), exclude=('node_modules', '__tests__'))
+
+    cache = SourceIndexCache('routes', CACHE_VERSION, root, enabled=use_cache)
+    facts = {}
+    for path in sources:
+        if path.is_file():
+            facts[path.resolve()] = cache.get(path, extract_route_facts)
+
+    # Mounts that resolve outside the scanned sources (middleware) are skipped
+    table = cache.get_derived('route_table', cache.fingerprint(),
+                              lambda: build_route_table(entry.resolve(), facts))
+    cache.save()
+    return RouteIndex([tuple(item) for item in table])
+
+
+def find_documented_paths(content: str) -> List[Tuple[int, Optional[str], str]]:
+    """(line, METHOD or None, path) for every /api path mentioned in content."""
+    found = []
+    for match in DOC_PATH_PATTERN.finditer(content):
+        raw = match.group(2)
+        path = raw.rstrip('.,:')
+        if '.' in path or '..' in raw or path.endswith('/'):
+            # File references (api/routes/tables.ts) and elisions (/api/...)
+            continue
+        line = content.count('\n', 0, match.start()) + 1
+        found.append((line, match.group(1), path))
+    return found
+
+
+def check_docs(root: Path, index: RouteIndex, include_archive: bool = False) -> List[Dict]:
+    """Drift entries for every documented path that the route table lacks."""
+    drift = []
+    for md_file in find_markdown_files(root):
+        rel = md_file.relative_to(root)
+        if not include_archive and ('archive' in rel.parts or 'archives' in rel.parts):
+            continue
+        try:
+            content = md_file.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            continue
+        for line, method, path in find_documented_paths(content):
+            if '*' in path:
+                continue
+            methods = index.methods_for(path)
+            if methods is None:
+                drift.append({'file': str(rel), 'line': line, 'method': method, 'path': path,
+                              'problem': 'missing', 'suggestions': index.suggest(path)})
+            elif method and method not in methods and 'ALL' not in methods:
+                drift.append({'file': str(rel), 'line': line, 'method': method, 'path': path,
+                              'problem': 'method', 'suggestions': sorted(methods)})
+    return drift
+
+
+def main():
+    """Main execution function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Check documented API paths against Express routes')
+    parser.add_argument('--root', type=Path, default=BASE_DIR, help='Repository root')
+    parser.add_argument('--include-archive', action='store_true', help='Also check docs/archive')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not write the route cache')
+    parser.add_argument('--json', dest='json_path', type=Path, default=None,
+                        help='Also write drift entries as JSON')
+    args = parser.parse_args()
+
+    root = args.root.resolve()
+
+    print("=" * 80)
+    print("API Route Drift Check")
+    print("=" * 80)
+
+    index = load_route_index(root, use_cache=not args.no_cache)
+    print(f"Route table: {len(index.table)} registered routes")
+
+    drift = check_docs(root, index, include_archive=args.include_archive)
+
+    if args.json_path:
+        args.json_path.write_text(json.dumps(drift, indent=2), encoding='utf-8')
+        print(f"Drift entries written to: {args.json_path}")
+
+    if not drift:
+        print("\n✅ No drift detected")
+        return 0
+
+    by_file = defaultdict(list)
+    for item in drift:
+        by_file[item['file']].append(item)
+
+    print(f"\n⚠️  DRIFT DETECTED: {len(drift)} documented paths in {len(by_file)} files\n")
+    for file_path, items in sorted(by_file.items()):
+        print(f"{file_path}")
+        for item in items:
+            label = f"{item['method']} {item['path']}" if item['method'] else item['path']
+            if item['problem'] == 'missing':
+                hint = f" → did you mean {', '.join(item['suggestions'])}?" if item['suggestions'] else ""
+                print(f"   L{item['line']}: {label} not registered{hint}")
+            else:
+                print(f"   L{item['line']}: {label} registered only for {', '.join(item['suggestions'])}")
+    return 1
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+WebSocket Event Status Check
+Derives the implementation status of every documented WebSocket event from
+the code instead of trusting hand-written "(working)" markers.
+
+The event index records, per source file, which event types are sent
+(`{ type: 'x', payload }` envelopes, `.send('x', ...)`, `.emit('x')`) and which are
+received (`.subscribe('x')`, `.on('x')`, `case 'x':`, `type === 'x'`) in
+WebSocket-related files of server/src and client/src. It is cached per file
+by content hash in .cache/doc-tools/ws-events.json, so only changed files are
+re-scanned and the check is cheap enough for every PR.
+
+Status of a documented event:
+- Server → Client: working (server sends, client listens), emitted (server
+  sends, no client listener) or planned (server never sends it)
+- Client → Server: working (server handles it) or planned
+
+Exit codes:
+- 0: Docs agree with the code
+- 1: Status claims that disagree with the code, or undocumented server events
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from source_index import SourceIndexCache, iter_source_files
+from validate_links import BASE_DIR
+
+CACHE_VERSION = 1
+
+DOC_PATH = Path('docs') / 'reference' / 'api' / 'WEBSOCKET_EVENTS.md'
+SOURCE_SUFFIXES = ('.ts', '.tsx', '.js')
+EXCLUDED_DIRS = ('node_modules', 'dist', '__tests__', 'tests', 'test')
+EXCLUDED_SUFFIXES = ('.d.ts', '.test.ts', '.test.tsx', '.spec.ts', '.spec.tsx')
+
+EVENT = r"([a-z][a-z0-9_]*(?:[:.][a-z0-9_]+)*)"
+WS_FILE_PATTERN = re.compile(r"WebSocket|webSocketService|\bwss?\b\.|broadcast\w*\(")
+SEND_PATTERNS = (
+    # Message envelopes: { type, payload | timestamp | error | data }
+    re.compile(r"\btype\s*:\s*['\"]" + EVENT + r"['\"]\s*,\s*(?=(?:payload|timestamp|error|data)\s*:)"),
+    re.compile(r"JSON\.stringify\(\s*\{\s*type\s*:\s*['\"]" + EVENT + r"['\"]"),
+    re.compile(r"\.send\(\s*['\"]" + EVENT + r"['\"]"),
+    re.compile(r"\.emit\(\s*['\"]" + EVENT + r"['\"]"),
+)
+RECEIVE_PATTERNS = (
+    re.compile(r"\.subscribe\(\s*['\"]" + EVENT + r"['\"]"),
+    re.compile(r"\.on\(\s*['\"]" + EVENT + r"['\"]"),
+    re.compile(r"\bcase\s+['\"]" + EVENT + r"['\"]\s*:"),
+    re.compile(r"\btype\s*===?\s*['\"]" + EVENT + r"['\"]"),
+)
+# Socket lifecycle events and JSON-schema type names, not message types
+IGNORED_RECEIVES = {'message', 'close', 'open', 'connection', 'upgrade', 'listening', 'headers'}
+IGNORED_SENDS = {'object', 'string', 'number', 'boolean', 'array', 'integer', 'null'}
+
+SECTION_PATTERN = re.compile(r"^###\s+(Server|Client)\s*(?:→|->)\s*(Server|Client)", re.MULTILINE)
+EVENT_HEADING_PATTERN = re.compile(r"^#{4,6}\s+`([^`]+)`", re.MULTILINE)
+MARKER_PATTERN = re.compile(r"\b" + EVENT + r" \((working|PLANNED[^)]*|emitted[^)]*)\)")
+STATUS_ROW_PATTERN = re.compile(r"^\|([^|\n]*)\|([^|\n]*)\|(.*)$", re.MULTILINE)
+
+WORKING = 'working'
+EMITTED = 'emitted'
+PLANNED = 'planned'
+
+MARKER_TEXT = {
+    WORKING: 'working',
+    EMITTED: 'emitted, no client listener',
+    PLANNED: 'PLANNED - Phase 3',
+}
+STATUS_CELL_TEXT = {
+    WORKING: '✅ Working',
+    EMITTED: '⚠️ Partial',
+    PLANNED: '⚠️ **PLANNED**',
+}
+
+
+def extract_event_usage(text: str) -> Dict[str, List[str]]:
+    """Event types sent and received by one source file."""
+    if not WS_FILE_PATTERN.search(text):
+        return {'sends': [], 'receives': []}
+    sends = {m.group(1) for pattern in SEND_PATTERNS for m in pattern.finditer(text)}
+    receives = {m.group(1) for pattern in RECEIVE_PATTERNS for m in pattern.finditer(text)}
+    return {'sends': sorted(sends - IGNORED_SENDS), 'receives': sorted(receives - IGNORED_RECEIVES)}
+
+
+@dataclass
+class EventIndex:
+    """Event type -> files, for each side and direction."""
+    server_sends: Dict[str, List[str]] = field(default_factory=lambda: defaultdict(list))
+    server_receives: Dict[str, List[str]] = field(default_factory=lambda: defaultdict(list))
+    client_sends: Dict[str, List[str]] = field(default_factory=lambda: defaultdict(list))
+    client_receives: Dict[str, List[str]] = field(default_factory=lambda: defaultdict(list))
+
+    def status(self, event: str, direction: str) -> str:
+        if direction == 'client':
+            return WORKING if event in self.server_receives else PLANNED
+        if event not in self.server_sends:
+            return PLANNED
+        return WORKING if event in self.client_receives else EMITTED
+
+
+def load_event_index(root: Path, use_cache: bool = True) -> EventIndex:
+    root = Path(root).resolve()
+    cache = SourceIndexCache('ws-events', CACHE_VERSION, root, enabled=use_cache)
+    index = EventIndex()
+    for side, sends, receives in (('server', index.server_sends, index.server_receives),
+                                  ('client', index.client_sends, index.client_receives)):
+        src = root / side / 'src'
+        if not src.is_dir():
+            continue
+        files = iter_source_files(src, SOURCE_SUFFIXES, exclude=EXCLUDED_DIRS,
+                                  exclude_suffixes=EXCLUDED_SUFFIXES)
+        for path, usage in sorted(cache.map(files, extract_event_usage).items()):
+            rel = str(path.relative_to(root))
+            for event in usage['sends']:
+                sends[event].append(rel)
+            for event in usage['receives']:
+                receives[event].append(rel)
+    cache.save()
+    return index
+
+
+@dataclass
+class DocumentedEvent:
+    name: str
+    direction: str  # 'server' (server → client) or 'client' (client → server)
+    line: int
+    claim: Optional[str] = None  # WORKING / EMITTED / PLANNED when the doc states one
+
+
+def claim_from_text(text: str) -> Optional[str]:
+    lowered = text.lower()
+    if 'planned' in lowered:
+        return PLANNED
+    if 'partial' in lowered or 'emitted' in lowered:
+        return EMITTED
+    if 'working' in lowered:
+        return WORKING
+    return None
+
+
+def parse_documented_events(text: str) -> Dict[str, DocumentedEvent]:
+    """Events documented under the direction sections, with any status claims."""
+    events: Dict[str, DocumentedEvent] = {}
+
+    def line_of(offset: int) -> int:
+        return text.count('\n', 0, offset) + 1
+
+    sections = [(m.start(), m.group(1).lower()) for m in SECTION_PATTERN.finditer(text)]
+    for match in EVENT_HEADING_PATTERN.finditer(text):
+        direction = 'server'
+        for start, source in sections:
+            if start < match.start():
+                direction = source
+        events.setdefault(match.group(1), DocumentedEvent(match.group(1), direction, line_of(match.start())))
+
+    for match in MARKER_PATTERN.finditer(text):
+        event = events.setdefault(match.group(1), DocumentedEvent(match.group(1), 'server',
+                                                                  line_of(match.start())))
+        event.claim = claim_from_text(match.group(2))
+
+    for match in STATUS_ROW_PATTERN.finditer(text):
+        claim = claim_from_text(match.group(2))
+        if claim is None:
+            continue
+        for name in re.findall(r"`([^`]+)`", match.group(1)):
+            if name in events and events[name].claim is None:
+                events[name].claim = claim
+    return events
+
+
+def status_note(names: List[str], events: Dict[str, DocumentedEvent], index: EventIndex) -> str:
+    """Notes cell for a rewritten status row, stating what the code shows."""
+    gaps = []
+    for name in names:
+        event = events[name]
+        status = index.status(name, event.direction)
+        if status == PLANNED:
+            verb = 'emitted' if event.direction == 'server' else 'handled'
+            gaps.append(f"`{name}` not {verb} by server/src")
+        elif status == EMITTED:
+            gaps.append(f"`{name}` has no client/src listener")
+    if not gaps:
+        return "Sender and handler found in the code (derived)"
+    return '; '.join(gaps) + " (derived)"
+
+
+def status_updates(text: str, index: EventIndex) -> List[Dict]:
+    """
+    DocumentationUpdater 'replace' updates that bring status markers and
+    Implementation Status rows in line with the event index. A rewritten row
+    also gets a derived Notes cell, since the old notes describe the old status.
+    """
+    events = parse_documented_events(text)
+    updates = []
+
+    for match in MARKER_PATTERN.finditer(text):
+        event = events[match.group(1)]
+        derived = index.status(event.name, event.direction)
+        if claim_from_text(match.group(2)) != derived:
+            updates.append({'type': 'replace', 'old': match.group(0),
+                            'new': f"{event.name} ({MARKER_TEXT[derived]})"})
+
+    for match in STATUS_ROW_PATTERN.finditer(text):
+        claimed = claim_from_text(match.group(2))
+        names = [name for name in re.findall(r"`([^`]+)`", match.group(1)) if name in events]
+        if claimed is None or not names:
+            continue
+        statuses = {index.status(name, events[name].direction) for name in names}
+        derived = statuses.pop() if len(statuses) == 1 else EMITTED
+        if derived != claimed:
+            note = status_note(names, events, index)
+            new_row = f"|{match.group(1)}| {STATUS_CELL_TEXT[derived]} | {note} |"
+            updates.append({'type': 'replace', 'old': match.group(0), 'new': new_row})
+    return updates
+
+
+def main():
+    """Main execution function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Check documented WebSocket events against the code')
+    parser.add_argument('--root', type=Path, default=BASE_DIR, help='Repository root')
+    parser.add_argument('--doc', type=Path, default=DOC_PATH, help='WebSocket events reference')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not write the event cache')
+    args = parser.parse_args()
+
+    root = args.root.resolve()
+    doc = args.doc if args.doc.is_absolute() else root / args.doc
+
+    print("=" * 80)
+    print("WebSocket Event Status Check")
+    print("=" * 80)
+
+    index = load_event_index(root, use_cache=not args.no_cache)
+    events = parse_documented_events(doc.read_text(encoding='utf-8'))
+
+    mismatches = 0
+    print(f"\n{'Event':<32} {'Direction':<16} {'Code':<10} Doc")
+    for event in sorted(events.values(), key=lambda e: e.line):
+        derived = index.status(event.name, event.direction)
+        direction = 'server → client' if event.direction == 'server' else 'client → server'
+        flag = ''
+        if event.claim is not None and event.claim != derived:
+            mismatches += 1
+            flag = '  ❌'
+        print(f"{event.name:<32} {direction:<16} {derived:<10} {event.claim or '-'}{flag}")
+
+    undocumented: Set[str] = set(index.server_sends) - set(events)
+    if undocumented:
+        print(f"\n⚠️  UNDOCUMENTED SERVER EVENTS ({len(undocumented)}):")
+        for name in sorted(undocumented):
+            print(f"   {name}: {', '.join(index.server_sends[name])}")
+
+    if mismatches:
+        print(f"\n❌ {mismatches} documented statuses disagree with the code")
+    if mismatches or undocumented:
+        return 1
+    print("\n✅ Documented event statuses match the code")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
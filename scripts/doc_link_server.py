@@ -0,0 +1,597 @@
+#!/usr/bin/env python3
+"""
+Markdown Link Language Server
+Serves link diagnostics, completion, fix-link code actions and go-to-definition
+for the documentation tree over the Language Server Protocol (stdio).
+
+The server keeps an in-memory index of every markdown file (by name and by
+directory) plus per-document heading anchors. The index is built once at
+startup and then updated from didOpen/didChange/didSave/didClose and
+workspace/didChangeWatchedFiles notifications, so keystroke-level requests
+never rescan the corpus. On `initialized` the server registers a `**/*.md`
+file watcher with clients that support dynamic registration, so files
+created by checkouts, renames or other tools reach the index. While the
+watcher is registered, missing link targets and heading anchors are cached
+until a file event arrives; without it, lookups the index cannot answer fall
+back to a stat.
+
+Tests: python -m pytest scripts/test_doc_link_server.py
+
+Usage:
+    python scripts/doc_link_server.py [--root PATH]
+
+Editors should launch it as a stdio language server for the `markdown`
+language. Only the Python standard library is required.
+"""
+
+import bisect
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlparse
+
+from find_duplicate_docs import build_canonical_map, find_duplicate_clusters, shared_name_files
+from fix_broken_links import find_correct_path
+from source_index import iter_source_files
+from validate_links import BASE_DIR, LINK_PATTERN, is_ignored
+
+HEADING_PATTERN = re.compile(r'^ {0,3}(#{1,6})\s+(.+?)\s*#*\s*$')
+FENCE_PATTERN = re.compile(r'^ {0,3}(```|~~~)')
+
+# LSP constants
+SYNC_INCREMENTAL = 2
+SEVERITY_ERROR = 1
+SEVERITY_WARNING = 2
+COMPLETION_FILE = 17
+COMPLETION_FOLDER = 19
+COMPLETION_REFERENCE = 18
+METHOD_NOT_FOUND = -32601
+WATCHER_REGISTRATION_ID = 'doc-link-server.markdown-watcher'
+
+
+def uri_to_path(uri: str) -> Path:
+    return Path(unquote(urlparse(uri).path)).resolve()
+
+
+def path_to_uri(path: Path) -> str:
+    return path.as_uri()
+
+
+def slugify(heading: str) -> str:
+    """GitHub-style heading anchor."""
+    slug = heading.strip().lower()
+    slug = re.sub(r'[^\w\- ]', '', slug)
+    return slug.replace(' ', '-')
+
+
+def extract_anchors(text: str) -> Dict[str, int]:
+    """Map anchor slug -> line number for every heading outside code fences."""
+    anchors: Dict[str, int] = {}
+    seen: Dict[str, int] = {}
+    in_fence = False
+    for lineno, line in enumerate(text.split('\n')):
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        match = HEADING_PATTERN.match(line)
+        if not match:
+            continue
+        slug = slugify(match.group(2))
+        count = seen.get(slug, 0)
+        seen[slug] = count + 1
+        anchors[slug if count == 0 else f"{slug}-{count}"] = lineno
+    return anchors
+
+
+def is_internal_link(link_url: str) -> bool:
+    """Same filter as the validator: relative links to markdown files."""
+    return not link_url.startswith(('http://', 'https://')) and '.md' in link_url
+
+
+class TextDocument:
+    """Open buffer with UTF-16 aware position <-> offset conversion."""
+
+    def __init__(self, path: Path, text: str, version: int = 0):
+        self.path = path
+        self.version = version
+        self.set_text(text)
+
+    def set_text(self, text: str):
+        self.text = text
+        self._line_starts = [0]
+        for match in re.finditer('\n', text):
+            self._line_starts.append(match.end())
+        self._anchors: Optional[Dict[str, int]] = None
+
+    @property
+    def anchors(self) -> Dict[str, int]:
+        if self._anchors is None:
+            self._anchors = extract_anchors(self.text)
+        return self._anchors
+
+    def line(self, lineno: int) -> str:
+        start = self._line_starts[lineno]
+        end = self._line_starts[lineno + 1] - 1 if lineno + 1 < len(self._line_starts) else len(self.text)
+        return self.text[start:end]
+
+    def offset(self, position: Dict) -> int:
+        lineno = min(position['line'], len(self._line_starts) - 1)
+        line = self.line(lineno)
+        units = position['character']
+        col = 0
+        while col < len(line) and units > 0:
+            units -= 2 if ord(line[col]) > 0xFFFF else 1
+            col += 1
+        return self._line_starts[lineno] + col
+
+    def position(self, offset: int) -> Dict:
+        lineno = bisect.bisect_right(self._line_starts, offset) - 1
+        prefix = self.text[self._line_starts[lineno]:offset]
+        return {'line': lineno, 'character': len(prefix.encode('utf-16-le')) // 2}
+
+    def range(self, start: int, end: int) -> Dict:
+        return {'start': self.position(start), 'end': self.position(end)}
+
+    def apply_change(self, change: Dict):
+        if 'range' not in change:
+            self.set_text(change['text'])
+            return
+        start = self.offset(change['range']['start'])
+        end = self.offset(change['range']['end'])
+        self.set_text(self.text[:start] + change['text'] + self.text[end:])
+
+    def links(self) -> List[Tuple[int, int, str, str]]:
+        """(url_start, url_end, link_text, link_url) for every markdown link."""
+        return [(m.start(2), m.end(2), m.group(1), m.group(2))
+                for m in LINK_PATTERN.finditer(self.text)]
+
+
+class LinkIndex:
+    """Incrementally maintained index of markdown files under a root."""
+
+    def __init__(self, root: Path):
+        self.root = root.resolve()
+        self.by_name: Dict[str, List[Path]] = {}
+        self.files: Set[Path] = set()
+        self.children: Dict[Path, Set[str]] = {}
+        self._anchors: Dict[Path, Tuple[float, Dict[str, int]]] = {}
+        self._canonical: Optional[Dict[Path, Path]] = None
+        # Targets seen missing; only kept while `watched` (see exists)
+        self._missing: Set[Path] = set()
+        # True once the client watches **/*.md: file changes then arrive via
+        # refresh/remove, so cached lookups are trusted without a stat
+        self.watched = False
+        self.open_docs: Dict[Path, TextDocument] = {}
+
+    def build(self):
+        # Prunes node_modules and hidden directories instead of walking into them
+        for md_file in iter_source_files(self.root, ('.md',)):
+            self.add(md_file)
+
+    def indexable(self, path: Path) -> bool:
+        return self.root in path.parents and not is_ignored(path, self.root)
+
+    def add(self, path: Path):
+        if path in self.files:
+            return
+        self.files.add(path)
+        self.by_name.setdefault(path.name, []).append(path)
+        self._duplicates_changed(path)
+        # Register every ancestor up to the root so directory completion works
+        child = path
+        for parent in path.parents:
+            self.children.setdefault(parent, set()).add(child.name)
+            if parent == self.root:
+                break
+            child = parent
+
+    def refresh(self, path: Path):
+        """Record a created or modified file."""
+        self.add(path)
+        self._anchors.pop(path, None)
+        self._missing.difference_update((path, *path.parents))
+        self._duplicates_changed(path)
+
+    def remove(self, path: Path):
+        if path not in self.files:
+            return
+        self._duplicates_changed(path)
+        self.files.discard(path)
+        self._anchors.pop(path, None)
+        siblings = self.by_name.get(path.name, [])
+        if path in siblings:
+            siblings.remove(path)
+        if not siblings:
+            self.by_name.pop(path.name, None)
+        child = path
+        for parent in path.parents:
+            entries = self.children.get(parent)
+            if entries is None:
+                break
+            entries.discard(child.name)
+            if entries or parent == self.root:
+                break
+            del self.children[parent]
+            child = parent
+
+    def _duplicates_changed(self, path: Path):
+        # Only files sharing a name take part in the canonical map
+        if len(self.by_name.get(path.name, ())) > 1:
+            self._canonical = None
+
+    def canonical_docs(self) -> Dict[Path, Path]:
+        """Near-duplicate -> canonical copy among same-name files, rebuilt lazily after changes."""
+        if self._canonical is None:
+            clusters = find_duplicate_clusters(shared_name_files(self.by_name))
+            self._canonical = build_canonical_map(clusters)
+        return self._canonical
+
+    def forget_missing(self):
+        """Drop cached negative lookups, e.g. after a batch of file events."""
+        self._missing.clear()
+
+    def exists(self, target: Path) -> bool:
+        if target in self.files or target in self.children:
+            return True
+        if target in self._missing:
+            return False
+        if not target.exists():
+            if self.watched:
+                self._missing.add(target)
+            return False
+        # Created behind the watcher's back (or before it was registered)
+        if target.suffix == '.md' and self.indexable(target):
+            self.add(target)
+        return True
+
+    def anchors(self, path: Path) -> Optional[Dict[str, int]]:
+        doc = self.open_docs.get(path)
+        if doc is not None:
+            return doc.anchors
+        cached = self._anchors.get(path)
+        if cached is not None and self.watched:
+            return cached[1]
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return None
+        if cached is None or cached[0] != mtime:
+            try:
+                text = path.read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError):
+                return None
+            cached = self._anchors[path] = (mtime, extract_anchors(text))
+        return cached[1]
+
+
+def resolve_target(source: Path, link_url: str) -> Tuple[Path, str]:
+    path_part, _, anchor = link_url.partition('#')
+    target = (source.parent / unquote(path_part)).resolve() if path_part else source
+    return target, anchor
+
+
+class DocLinkServer:
+    def __init__(self, root: Path = BASE_DIR, stdin=None, stdout=None):
+        self.index = LinkIndex(root)
+        self.stdin = stdin or sys.stdin.buffer
+        self.stdout = stdout or sys.stdout.buffer
+        self.running = True
+        self.watch_files = False
+        self._next_request_id = 0
+        self.pending_requests: Dict[int, str] = {}
+        self.handlers = {
+            'initialize': self.initialize,
+            'initialized': self.initialized,
+            'shutdown': lambda params: None,
+            'exit': self.exit,
+            'textDocument/didOpen': self.did_open,
+            'textDocument/didChange': self.did_change,
+            'textDocument/didSave': self.did_save,
+            'textDocument/didClose': self.did_close,
+            'workspace/didChangeWatchedFiles': self.did_change_watched_files,
+            'textDocument/completion': self.completion,
+            'textDocument/codeAction': self.code_action,
+            'textDocument/definition': self.definition,
+        }
+
+    # -- transport -------------------------------------------------------
+
+    def read_message(self) -> Optional[Dict]:
+        headers = {}
+        while True:
+            line = self.stdin.readline()
+            if not line:
+                return None
+            line = line.decode('ascii').strip()
+            if not line:
+                break
+            key, _, value = line.partition(':')
+            headers[key.strip().lower()] = value.strip()
+        body = self.stdin.read(int(headers['content-length']))
+        return json.loads(body.decode('utf-8'))
+
+    def send(self, message: Dict):
+        message['jsonrpc'] = '2.0'
+        body = json.dumps(message).encode('utf-8')
+        self.stdout.write(f"Content-Length: {len(body)}\r\n\r\n".encode('ascii') + body)
+        self.stdout.flush()
+
+    def notify(self, method: str, params: Dict):
+        self.send({'method': method, 'params': params})
+
+    def request(self, method: str, params: Dict):
+        """Send a server-to-client request; the response is handled in dispatch."""
+        self._next_request_id += 1
+        self.pending_requests[self._next_request_id] = method
+        self.send({'id': self._next_request_id, 'method': method, 'params': params})
+
+    def serve(self):
+        while self.running:
+            message = self.read_message()
+            if message is None:
+                break
+            self.dispatch(message)
+
+    def dispatch(self, message: Dict):
+        msg_id = message.get('id')
+        if 'method' not in message:
+            # Response to one of our requests
+            method = self.pending_requests.pop(msg_id, None)
+            if 'error' in message:
+                print(f"❌ {method or 'request'} failed: {message['error'].get('message')}", file=sys.stderr)
+            return
+        handler = self.handlers.get(message['method'])
+        if handler is None:
+            if msg_id is not None:
+                self.send({'id': msg_id, 'error': {'code': METHOD_NOT_FOUND,
+                                                   'message': f"Unhandled method {message.get('method')}"}})
+            return
+        try:
+            result = handler(message.get('params') or {})
+        except Exception as e:
+            if msg_id is None:
+                print(f"❌ Error handling {message.get('method')}: {e}", file=sys.stderr)
+                return
+            self.send({'id': msg_id, 'error': {'code': -32603, 'message': str(e)}})
+            return
+        if msg_id is not None:
+            self.send({'id': msg_id, 'result': result})
+
+    # -- lifecycle -------------------------------------------------------
+
+    def initialize(self, params: Dict) -> Dict:
+        folders = params.get('workspaceFolders') or []
+        root_uri = folders[0]['uri'] if folders else params.get('rootUri')
+        if root_uri:
+            self.index = LinkIndex(uri_to_path(root_uri))
+        self.index.build()
+        workspace = (params.get('capabilities') or {}).get('workspace') or {}
+        self.watch_files = bool((workspace.get('didChangeWatchedFiles') or {}).get('dynamicRegistration'))
+        return {
+            'capabilities': {
+                'textDocumentSync': {'openClose': True, 'change': SYNC_INCREMENTAL, 'save': True},
+                'completionProvider': {'triggerCharacters': ['(', '/', '#', '.']},
+                'codeActionProvider': {'codeActionKinds': ['quickfix']},
+                'definitionProvider': True,
+            },
+            'serverInfo': {'name': 'doc-link-server'},
+        }
+
+    def initialized(self, params: Dict):
+        if not self.watch_files:
+            return
+        self.request('client/registerCapability', {'registrations': [{
+            'id': WATCHER_REGISTRATION_ID,
+            'method': 'workspace/didChangeWatchedFiles',
+            'registerOptions': {'watchers': [{'globPattern': '**/*.md'}]},
+        }]})
+        self.index.watched = True
+
+    def exit(self, params):
+        self.running = False
+
+    # -- document sync ---------------------------------------------------
+
+    def did_open(self, params: Dict):
+        item = params['textDocument']
+        path = uri_to_path(item['uri'])
+        self.index.open_docs[path] = TextDocument(path, item['text'], item.get('version', 0))
+        if path.suffix == '.md' and self.index.indexable(path):
+            self.index.add(path)
+        self.publish_diagnostics(path)
+
+    def did_change(self, params: Dict):
+        path = uri_to_path(params['textDocument']['uri'])
+        doc = self.index.open_docs.get(path)
+        if doc is None:
+            return
+        for change in params['contentChanges']:
+            doc.apply_change(change)
+        doc.version = params['textDocument'].get('version', doc.version)
+        self.publish_diagnostics(path)
+
+    def did_save(self, params: Dict):
+        path = uri_to_path(params['textDocument']['uri'])
+        if path in self.index.open_docs:
+            self.publish_diagnostics(path)
+
+    def did_close(self, params: Dict):
+        path = uri_to_path(params['textDocument']['uri'])
+        self.index.open_docs.pop(path, None)
+        self.notify('textDocument/publishDiagnostics',
+                    {'uri': path_to_uri(path), 'diagnostics': []})
+
+    def did_change_watched_files(self, params: Dict):
+        self.index.forget_missing()
+        for change in params.get('changes', []):
+            path = uri_to_path(change['uri'])
+            if path.suffix != '.md' or not self.index.indexable(path):
+                continue
+            if change['type'] == 3:  # Deleted
+                self.index.remove(path)
+            else:
+                self.index.refresh(path)
+        # Targets may have appeared or disappeared under open documents
+        for path in list(self.index.open_docs):
+            self.publish_diagnostics(path)
+
+    # -- diagnostics -----------------------------------------------------
+
+    def diagnose(self, doc: TextDocument) -> List[Dict]:
+        diagnostics = []
+        for start, end, _, link_url in doc.links():
+            if not is_internal_link(link_url) or not link_url.split('#')[0]:
+                continue
+            target, anchor = resolve_target(doc.path, link_url)
+            if not self.index.exists(target):
+                diagnostics.append({
+                    'range': doc.range(start, end),
+                    'severity': SEVERITY_ERROR,
+                    'source': 'doc-links',
+                    'code': 'broken-link',
+                    'message': f"Broken link: {link_url}",
+                    'data': {'url': link_url},
+                })
+                continue
+            if anchor:
+                anchors = self.index.anchors(target)
+                if anchors is not None and anchor not in anchors:
+                    diagnostics.append({
+                        'range': doc.range(start, end),
+                        'severity': SEVERITY_WARNING,
+                        'source': 'doc-links',
+                        'code': 'missing-anchor',
+                        'message': f"No heading for #{anchor} in {target.name}",
+                        'data': {'url': link_url},
+                    })
+        return diagnostics
+
+    def publish_diagnostics(self, path: Path):
+        doc = self.index.open_docs[path]
+        self.notify('textDocument/publishDiagnostics', {
+            'uri': path_to_uri(path),
+            'version': doc.version,
+            'diagnostics': self.diagnose(doc),
+        })
+
+    # -- language features -----------------------------------------------
+
+    def link_at(self, doc: TextDocument, offset: int) -> Optional[Tuple[int, int, str, str]]:
+        for link in doc.links():
+            if link[0] <= offset <= link[1]:
+                return link
+        return None
+
+    def completion(self, params: Dict) -> List[Dict]:
+        path = uri_to_path(params['textDocument']['uri'])
+        doc = self.index.open_docs.get(path)
+        if doc is None:
+            return []
+        offset = doc.offset(params['position'])
+        line_start = doc.text.rfind('\n', 0, offset) + 1
+        opener = doc.text.rfind('](', line_start, offset)
+        if opener == -1:
+            return []
+        typed = doc.text[opener + 2:offset]
+        if ')' in typed or ' ' in typed:
+            return []
+
+        if '#' in typed:
+            path_part, _, partial = typed.partition('#')
+            target, _ = resolve_target(path, path_part)
+            anchors = self.index.anchors(target) or {}
+            start = offset - len(partial)
+            return [{
+                'label': slug,
+                'kind': COMPLETION_REFERENCE,
+                'detail': f"{target.name}:{line + 1}",
+                'textEdit': {'range': doc.range(start, offset), 'newText': slug},
+            } for slug, line in anchors.items() if slug.startswith(partial)]
+
+        dir_part, _, partial = typed.rpartition('/')
+        directory = (path.parent / dir_part).resolve() if dir_part else path.parent
+        start = offset - len(partial)
+        items = []
+        for name in sorted(self.index.children.get(directory, ())):
+            if not name.startswith(partial):
+                continue
+            is_dir = (directory / name) in self.index.children
+            items.append({
+                'label': name + ('/' if is_dir else ''),
+                'kind': COMPLETION_FOLDER if is_dir else COMPLETION_FILE,
+                'textEdit': {'range': doc.range(start, offset),
+                             'newText': name + ('/' if is_dir else '')},
+            })
+        if not dir_part and '../'.startswith(partial) and path.parent != self.index.root:
+            items.append({'label': '../', 'kind': COMPLETION_FOLDER,
+                          'textEdit': {'range': doc.range(start, offset), 'newText': '../'}})
+        return items
+
+    def code_action(self, params: Dict) -> List[Dict]:
+        uri = params['textDocument']['uri']
+        path = uri_to_path(uri)
+        doc = self.index.open_docs.get(path)
+        if doc is None:
+            return []
+        start = doc.offset(params['range']['start'])
+        end = doc.offset(params['range']['end'])
+        actions = []
+        for url_start, url_end, _, link_url in doc.links():
+            if url_end < start or url_start > end or not is_internal_link(link_url):
+                continue
+            target, anchor = resolve_target(path, link_url)
+            if self.index.exists(target):
+                continue
+            corrected = find_correct_path(path, link_url, cache=self.index.by_name,
+                                          canonical=self.index.canonical_docs())
+            if not corrected:
+                continue
+            new_link = corrected + ('#' + anchor if anchor else '')
+            if new_link == link_url:
+                continue
+            actions.append({
+                'title': f"Fix link: {new_link}",
+                'kind': 'quickfix',
+                'isPreferred': True,
+                'edit': {'changes': {uri: [{'range': doc.range(url_start, url_end),
+                                            'newText': new_link}]}},
+            })
+        return actions
+
+    def definition(self, params: Dict) -> Optional[Dict]:
+        path = uri_to_path(params['textDocument']['uri'])
+        doc = self.index.open_docs.get(path)
+        if doc is None:
+            return None
+        link = self.link_at(doc, doc.offset(params['position']))
+        if link is None or link[3].startswith(('http://', 'https://')):
+            return None
+        target, anchor = resolve_target(path, link[3])
+        if not self.index.exists(target) or target.is_dir():
+            return None
+        line = 0
+        if anchor:
+            line = (self.index.anchors(target) or {}).get(anchor, 0)
+        position = {'line': line, 'character': 0}
+        return {'uri': path_to_uri(target), 'range': {'start': position, 'end': position}}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Markdown link language server (stdio)')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='Workspace root used when the client does not send one')
+    parser.add_argument('--stdio', action='store_true', help='Accepted for editor compatibility')
+    args = parser.parse_args()
+
+    DocLinkServer(args.root).serve()
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Document Detection
+Finds clusters of near-identical markdown documents (copied summaries,
+archived analyses, drifting indexes) using MinHash signatures and LSH banding.
+
+Signatures use one-permutation MinHash: every shingle is hashed once and
+binned, so a document costs O(words) instead of O(words x permutations).
+LSH banding only compares documents that share a band bucket, so the run
+stays sub-quadratic and scales to 100k documents.
+
+Each cluster gets a canonical copy (non-archive first, then under docs/,
+then the shallowest path). fix_broken_links and the doc link server use the
+canonical map to rank near-identical link candidates.
+"""
+
+import hashlib
+import json
+import re
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from validate_links import BASE_DIR, find_markdown_files
+
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+
+WORD_PATTERN = re.compile(r'\w+')
+_MASK = (1 << 64) - 1
+_EMPTY = _MASK
+
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> set:
+    """Word k-shingles of the lower-cased text."""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) <= k:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def minhash(shingle_set: Iterable[str], num_perm: int = NUM_PERM) -> array:
+    """One-permutation MinHash signature with rotation densification."""
+    bins = [_EMPTY] * num_perm
+    for shingle in shingle_set:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        idx = h % num_perm
+        if h < bins[idx]:
+            bins[idx] = h
+
+    # Fill empty bins from the next non-empty bin to the right (circular)
+    filled = [i for i, value in enumerate(bins) if value != _EMPTY]
+    if filled and len(filled) < num_perm:
+        for i in range(num_perm):
+            if bins[i] != _EMPTY:
+                continue
+            distance = 1
+            while bins[(i + distance) % num_perm] == _EMPTY:
+                distance += 1
+            source = bins[(i + distance) % num_perm]
+            bins[i] = (source + distance * 0x9E3779B97F4A7C15) % _MASK
+    return array('Q', bins)
+
+
+def similarity(a: array, b: array) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def is_archived(path: Path) -> bool:
+    return 'archive' in path.parts or 'archives' in path.parts
+
+
+def canonical_key(path: Path):
+    """Sort key: non-archive first, then under docs/, then shallowest, then name."""
+    return (is_archived(path), 'docs' not in path.parts, len(path.parts), str(path))
+
+
+class DuplicateFinder:
+    """Collects signatures and groups near-duplicates with LSH banding."""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD,
+                 num_perm: int = NUM_PERM, bands: int = BANDS):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.paths: List[Path] = []
+        self.signatures: List[array] = []
+
+    def add(self, path: Path, text: str):
+        shingle_set = shingles(text)
+        if not shingle_set:
+            return
+        self.paths.append(path)
+        self.signatures.append(minhash(shingle_set, self.num_perm))
+
+    def add_files(self, files: Iterable[Path]):
+        for path in files:
+            try:
+                text = path.read_text(encoding='utf-8', errors='replace')
+            except OSError:
+                continue
+            self.add(path, text)
+
+    def clusters(self) -> List[List[Path]]:
+        """Clusters of near-duplicate documents, canonical copy first."""
+        parent = list(range(len(self.paths)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(self.bands):
+            start = band * self.rows
+            buckets: Dict[bytes, List[int]] = defaultdict(list)
+            for doc_id, signature in enumerate(self.signatures):
+                buckets[signature[start:start + self.rows].tobytes()].append(doc_id)
+
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                # Compare against one representative per bucket instead of all
+                # pairs; exact-copy buckets can hold thousands of documents.
+                rep = members[0]
+                for other in members[1:]:
+                    if find(rep) == find(other):
+                        continue
+                    if similarity(self.signatures[rep], self.signatures[other]) >= self.threshold:
+                        parent[find(other)] = find(rep)
+
+        groups: Dict[int, List[Path]] = defaultdict(list)
+        for doc_id, path in enumerate(self.paths):
+            groups[find(doc_id)].append(path)
+
+        result = [sorted(group, key=canonical_key) for group in groups.values() if len(group) > 1]
+        result.sort(key=lambda group: (-len(group), str(group[0])))
+        return result
+
+
+def find_duplicate_clusters(files: Iterable[Path],
+                            threshold: float = DEFAULT_THRESHOLD) -> List[List[Path]]:
+    """Near-duplicate clusters among files, canonical copy first in each."""
+    finder = DuplicateFinder(threshold=threshold)
+    finder.add_files(files)
+    return finder.clusters()
+
+
+def shared_name_files(by_name: Dict[str, List[Path]]) -> List[Path]:
+    """
+    Files whose name is shared with another file. Candidate ranking only
+    consults the canonical map when a filename has several candidates, so
+    these are the only documents worth fingerprinting.
+    """
+    return [path for paths in by_name.values() if len(paths) > 1 for path in paths]
+
+
+def build_canonical_map(clusters: List[List[Path]]) -> Dict[Path, Path]:
+    """Map every clustered document to its cluster's canonical copy."""
+    return {path: cluster[0] for cluster in clusters for path in cluster}
+
+
+def main():
+    """Main execution function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Find near-duplicate markdown documents')
+    parser.add_argument('--root', type=Path, default=BASE_DIR, help='Repository root to scan')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Minimum estimated Jaccard similarity (default: 0.8)')
+    parser.add_argument('--json', dest='json_path', type=Path, default=None,
+                        help='Also write clusters as JSON')
+    args = parser.parse_args()
+
+    root = args.root.resolve()
+
+    print("=" * 80)
+    print("Near-Duplicate Document Detection")
+    print("=" * 80)
+
+    md_files = find_markdown_files(root)
+    print(f"Found {len(md_files)} markdown files to analyze")
+    clusters = find_duplicate_clusters(md_files, threshold=args.threshold)
+
+    def rel(path: Path) -> str:
+        return str(path.relative_to(root))
+
+    print(f"Found {len(clusters)} near-duplicate clusters "
+          f"({sum(len(c) for c in clusters)} documents)\n")
+    for i, cluster in enumerate(clusters, 1):
+        print(f"{i}. {rel(cluster[0])} (canonical)")
+        for path in cluster[1:]:
+            print(f"   - {rel(path)}")
+
+    if args.json_path:
+        data = [{'canonical': rel(c[0]), 'duplicates': [rel(p) for p in c[1:]]} for c in clusters]
+        args.json_path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+        print(f"\nClusters written to: {args.json_path}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
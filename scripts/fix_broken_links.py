@@ -9,51 +9,90 @@ This script:
 3. Attempts to find correct paths for broken links
 4. Fixes links using intelligent pattern matching
 5. Generates comprehensive report
+
+With --mmap, files are memory-mapped and scanned as bytes; fixes are spliced
+into the original bytes, so files with invalid UTF-8 are still repaired and
+reported instead of skipped.
+
+All state of a run (statistics, file cache, near-duplicate map, fix log and
+diagnostics) lives on a `RepairRun` that is passed to each step, so the tool
+can be pointed at any root and run more than once per interpreter.
 """
 
+import mmap
 import os
 import re
+import shutil
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
-import json
+from dataclasses import dataclass, field
+from itertools import groupby
+
+from find_duplicate_docs import build_canonical_map, find_duplicate_clusters, shared_name_files
+from link_records import ModifiedFile, RepairLog
+from report_writer import ReportWriter
+from validate_links import find_markdown_files, is_ignored, scan_markdown_links
 
 # Base directory for the project
-BASE_DIR = Path("/Users/mikeyoung/CODING/rebuild-6.0")
-DOCS_DIR = BASE_DIR / "docs"
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+NO_CANDIDATES_REASON = "No candidates found in file cache"
+
+
+def new_stats() -> Dict[str, int]:
+    return {
+        "total_files_scanned": 0,
+        "total_links_found": 0,
+        "broken_links_found": 0,
+        "links_fixed": 0,
+        "links_unfixable": 0,
+        "files_modified": 0
+    }
+
 
-# Track statistics
-stats = {
-    "total_files_scanned": 0,
-    "total_links_found": 0,
-    "broken_links_found": 0,
-    "links_fixed": 0,
-    "links_unfixable": 0,
-    "files_modified": 0
-}
+@dataclass
+class RepairRun:
+    """State of one repair run over a documentation root."""
+    root: Path = BASE_DIR
+    stats: Dict[str, int] = field(default_factory=new_stats)
+    # Track fixes by pattern
+    fixes_by_pattern: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    # File location cache - build once, use many times
+    file_cache: Dict[str, List[Path]] = field(default_factory=dict)
+    # Near-duplicate document -> canonical copy, built from the file cache
+    canonical_docs: Dict[Path, Path] = field(default_factory=dict)
+    # Fixes, unfixable links and modified files as interned integer records
+    log: RepairLog = field(default_factory=RepairLog)
+    # Files that could not be fully read or decoded
+    read_diagnostics: List[Dict[str, str]] = field(default_factory=list)
 
-# Track fixes by pattern
-fixes_by_pattern = defaultdict(int)
-unfixable_links = []
+    def __post_init__(self):
+        self.root = Path(self.root).resolve()
 
-# File location cache - build once, use many times
-file_cache: Dict[str, List[Path]] = {}
+    def relative(self, path: Path) -> str:
+        return str(path.relative_to(self.root))
 
 
-def build_file_cache():
+def build_file_cache(run: RepairRun):
     """Build a cache of all markdown files by filename."""
     print("Building file cache...")
-    for md_file in BASE_DIR.rglob("*.md"):
+    for md_file in run.root.rglob("*.md"):
         # Skip node_modules and hidden directories
-        if "node_modules" in md_file.parts or any(part.startswith('.') for part in md_file.parts[:-1]):
+        if is_ignored(md_file, run.root):
             continue
+        run.file_cache.setdefault(md_file.name, []).append(md_file)
 
-        filename = md_file.name
-        if filename not in file_cache:
-            file_cache[filename] = []
-        file_cache[filename].append(md_file)
+    cache = run.file_cache
+    print(f"Cached {sum(len(v) for v in cache.values())} files ({len(cache)} unique names)")
 
-    print(f"Cached {sum(len(v) for v in file_cache.values())} files ({len(file_cache)} unique names)")
+
+def build_duplicate_index(run: RepairRun):
+    """Map near-duplicate documents to their canonical copy for candidate ranking."""
+    print("Detecting near-duplicate documents...")
+    clusters = find_duplicate_clusters(shared_name_files(run.file_cache))
+    run.canonical_docs.update(build_canonical_map(clusters))
+    print(f"Found {len(clusters)} near-duplicate clusters ({len(run.canonical_docs)} documents)")
 
 
 def extract_markdown_links(content: str) -> List[Tuple[str, str, str]]:
@@ -96,9 +135,9 @@ def resolve_link(source_file: Path, link_url: str) -> Tuple[bool, Path]:
     return target.exists(), target
 
 
-def find_file_in_cache(filename: str) -> List[Path]:
+def find_file_in_cache(filename: str, cache: Dict[str, List[Path]]) -> List[Path]:
     """Find all instances of a filename in the cache."""
-    return file_cache.get(filename, [])
+    return cache.get(filename, [])
 
 
 def calculate_relative_path(source: Path, target: Path) -> str:
@@ -110,16 +149,24 @@ def calculate_relative_path(source: Path, target: Path) -> str:
         return str(target)
 
 
-def find_correct_path(source_file: Path, broken_link: str) -> str:
+def find_correct_path(source_file: Path, broken_link: str,
+                      cache: Dict[str, List[Path]],
+                      canonical: Optional[Dict[Path, Path]] = None) -> Optional[str]:
     """
     Attempt to find the correct path for a broken link.
-    Returns: corrected link or original if no fix found
+    `cache` maps filenames to paths and `canonical` maps near-duplicate
+    documents to their canonical copy (e.g. a RepairRun's file_cache and
+    canonical_docs).
+    Returns: corrected link, or None if no candidate exists
     """
+    if canonical is None:
+        canonical = {}
+
     # Extract just the filename
-    filename = Path(broken_link).name
+    filename = Path(broken_link.split('#')[0]).name
 
     # Find all instances of this file
-    candidates = find_file_in_cache(filename)
+    candidates = find_file_in_cache(filename, cache)
 
     if not candidates:
         return None
@@ -153,6 +200,11 @@ def find_correct_path(source_file: Path, broken_link: str) -> str:
         if 'archive' not in candidate_parts:
             score += 3
 
+        # Among near-duplicate copies, prefer the canonical one
+        canonical_copy = canonical.get(candidate)
+        if canonical_copy is not None:
+            score += 4 if canonical_copy == candidate else -4
+
         # Check for common directory patterns from the broken link
         if 'how-to' in original_parts and 'how-to' in candidate_parts:
             score += 5
@@ -171,7 +223,7 @@ def find_correct_path(source_file: Path, broken_link: str) -> str:
         return calculate_relative_path(source_file, best_match)
 
     # If still multiple good candidates, prefer the first non-archive one
-    for candidate in candidates:
+    for candidate in sorted(candidates, key=lambda c: canonical.get(c, c) != c):
         if 'archive' not in candidate.parts:
             return calculate_relative_path(source_file, candidate)
 
@@ -179,22 +231,92 @@ def find_correct_path(source_file: Path, broken_link: str) -> str:
     return calculate_relative_path(source_file, candidates[0])
 
 
-def fix_links_in_file(file_path: Path, dry_run: bool = False) -> Dict:
+def repair_link(run: RepairRun, file_path: Path, link_text: str, link_url: str,
+                file_stats: Dict) -> Optional[str]:
     """
-    Fix broken links in a single file.
-    Returns: Dict with statistics for this file
+    Try to repair one link, updating file_stats and the run's fix log.
+    Returns: the replacement `[text](url)` markup, or None if the link is valid or unfixable
     """
-    file_stats = {
+    exists, resolved_path = resolve_link(file_path, link_url)
+    if exists:
+        return None
+
+    file_stats["broken_links"] += 1
+    rel_path = run.relative(file_path)
+
+    # Try to find correct path
+    corrected_link = find_correct_path(file_path, link_url, run.file_cache, run.canonical_docs)
+
+    if corrected_link and corrected_link != link_url:
+        # Preserve anchor if present
+        anchor = ""
+        if '#' in link_url:
+            anchor = '#' + link_url.split('#', 1)[1]
+
+        new_link = corrected_link + anchor
+
+        # Verify the fix works
+        fix_exists, _ = resolve_link(file_path, new_link)
+
+        if fix_exists:
+            file_stats["fixed_links"] += 1
+            run.log.add_fix(rel_path, link_text, link_url, new_link)
+
+            # Track pattern
+            pattern_key = f"{Path(link_url).name} -> {Path(new_link).name}"
+            run.fixes_by_pattern[pattern_key] += 1
+            return f"[{link_text}]({new_link})"
+
+        file_stats["unfixable_links"] += 1
+        run.log.add_unfixable(rel_path, link_url, attempted=new_link)
+    else:
+        file_stats["unfixable_links"] += 1
+        run.log.add_unfixable(rel_path, link_url)
+    return None
+
+
+def splice_file(file_path: Path, edits: List[Tuple[int, int, bytes]]):
+    """Rewrite file_path with byte-range replacements, streaming from a memory map."""
+    tmp_path = file_path.with_name(file_path.name + '.tmp')
+    with open(file_path, 'rb') as src, open(tmp_path, 'wb') as out:
+        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as buf, memoryview(buf) as view:
+            pos = 0
+            for start, end, replacement in sorted(edits):
+                out.write(view[pos:start])
+                out.write(replacement)
+                pos = end
+            out.write(view[pos:])
+    shutil.copymode(file_path, tmp_path)
+    os.replace(tmp_path, file_path)
+
+
+def new_file_stats() -> Dict:
+    return {
         "links_found": 0,
         "broken_links": 0,
         "fixed_links": 0,
         "unfixable_links": 0,
-        "fixes": []
+        "diagnostics": []
     }
 
+
+def fix_links_in_file(run: RepairRun, file_path: Path, dry_run: bool = False,
+                      use_mmap: bool = False) -> Dict:
+    """
+    Fix broken links in a single file.
+    Returns: Dict with statistics for this file
+    """
+    if use_mmap:
+        return fix_links_in_mapped_file(run, file_path, dry_run=dry_run)
+
+    file_stats = new_file_stats()
+
     try:
         content = file_path.read_text(encoding='utf-8')
         original_content = content
+    except UnicodeDecodeError as e:
+        file_stats["diagnostics"].append(f"invalid UTF-8 at byte {e.start}; file not processed (try --mmap)")
+        return file_stats
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
         return file_stats
@@ -203,52 +325,9 @@ def fix_links_in_file(file_path: Path, dry_run: bool = False) -> Dict:
     file_stats["links_found"] = len(links)
 
     for full_match, link_text, link_url in links:
-        exists, resolved_path = resolve_link(file_path, link_url)
-
-        if not exists:
-            file_stats["broken_links"] += 1
-
-            # Try to find correct path
-            corrected_link = find_correct_path(file_path, link_url)
-
-            if corrected_link and corrected_link != link_url:
-                # Preserve anchor if present
-                anchor = ""
-                if '#' in link_url:
-                    anchor = '#' + link_url.split('#', 1)[1]
-
-                new_link = corrected_link + anchor
-                new_full_match = f"[{link_text}]({new_link})"
-
-                # Verify the fix works
-                fix_exists, _ = resolve_link(file_path, new_link)
-
-                if fix_exists:
-                    content = content.replace(full_match, new_full_match, 1)
-                    file_stats["fixed_links"] += 1
-                    file_stats["fixes"].append({
-                        "old": link_url,
-                        "new": new_link,
-                        "text": link_text
-                    })
-
-                    # Track pattern
-                    pattern_key = f"{Path(link_url).name} -> {Path(new_link).name}"
-                    fixes_by_pattern[pattern_key] += 1
-                else:
-                    file_stats["unfixable_links"] += 1
-                    unfixable_links.append({
-                        "file": str(file_path.relative_to(BASE_DIR)),
-                        "link": link_url,
-                        "attempted_fix": new_link
-                    })
-            else:
-                file_stats["unfixable_links"] += 1
-                unfixable_links.append({
-                    "file": str(file_path.relative_to(BASE_DIR)),
-                    "link": link_url,
-                    "reason": "No candidates found in file cache"
-                })
+        new_full_match = repair_link(run, file_path, link_text, link_url, file_stats)
+        if new_full_match is not None:
+            content = content.replace(full_match, new_full_match, 1)
 
     # Write changes if not dry run and content changed
     if not dry_run and content != original_content:
@@ -262,127 +341,158 @@ def fix_links_in_file(file_path: Path, dry_run: bool = False) -> Dict:
     return file_stats
 
 
-def process_all_files(dry_run: bool = False):
-    """Process all markdown files in the repository."""
-    print(f"\n{'DRY RUN - ' if dry_run else ''}Processing markdown files...")
+def fix_links_in_mapped_file(run: RepairRun, file_path: Path, dry_run: bool = False) -> Dict:
+    """
+    Memory-mapped variant of fix_links_in_file.
+    Only matched link spans are decoded; fixes are spliced in as bytes.
+    """
+    file_stats = new_file_stats()
 
-    # Find all markdown files
-    md_files = []
-    for ext in ['*.md', '*.MD']:
-        md_files.extend(DOCS_DIR.rglob(ext))
-        md_files.extend(BASE_DIR.glob(ext))  # Include root level
+    try:
+        scan = scan_markdown_links(file_path)
+    except OSError as e:
+        print(f"Error reading {file_path}: {e}")
+        return file_stats
 
-    # Remove duplicates and filter out node_modules
-    md_files = list(set(md_files))
-    md_files = [f for f in md_files if 'node_modules' not in f.parts and not any(part.startswith('.') for part in f.parts[:-1])]
-    md_files.sort()
+    file_stats["diagnostics"].extend(scan.diagnostics)
+    file_stats["links_found"] = len(scan.links)
+
+    edits = []
+    for link in scan.links:
+        new_full_match = repair_link(run, file_path, link.link_text, link.link_url, file_stats)
+        if new_full_match is not None:
+            edits.append((link.start, link.end, new_full_match.encode('utf-8')))
+
+    if not dry_run and edits:
+        try:
+            splice_file(file_path, edits)
+        except OSError as e:
+            print(f"Error writing {file_path}: {e}")
+
+    return file_stats
+
+
+def process_all_files(run: RepairRun, dry_run: bool = False, use_mmap: bool = False) -> List[ModifiedFile]:
+    """Process all markdown files under the run's root."""
+    print(f"\n{'DRY RUN - ' if dry_run else ''}Processing markdown files...")
+
+    # docs/ plus root-level markdown, skipping node_modules and hidden directories
+    md_files = find_markdown_files(run.root)
+    stats, log = run.stats, run.log
 
     stats["total_files_scanned"] = len(md_files)
     print(f"Found {len(md_files)} markdown files to process")
 
-    modified_files = []
-
     for i, md_file in enumerate(md_files, 1):
-        rel_path = md_file.relative_to(BASE_DIR)
+        rel_path = run.relative(md_file)
         print(f"\r[{i}/{len(md_files)}] Processing {rel_path}...", end='', flush=True)
 
-        file_stats = fix_links_in_file(md_file, dry_run=dry_run)
+        fixes_start = len(log.fixes)
+        file_stats = fix_links_in_file(run, md_file, dry_run=dry_run, use_mmap=use_mmap)
 
         stats["total_links_found"] += file_stats["links_found"]
         stats["broken_links_found"] += file_stats["broken_links"]
         stats["links_fixed"] += file_stats["fixed_links"]
         stats["links_unfixable"] += file_stats["unfixable_links"]
+        for message in file_stats["diagnostics"]:
+            run.read_diagnostics.append({"file": rel_path, "message": message})
 
         if file_stats["fixed_links"] > 0:
             stats["files_modified"] += 1
-            modified_files.append({
-                "file": str(rel_path),
-                "fixes": file_stats["fixes"],
-                "count": file_stats["fixed_links"]
-            })
+            log.mark_modified(rel_path, fixes_start)
 
     print()  # New line after progress
-    return modified_files
+    return log.modified
 
 
-def generate_report(modified_files: List[Dict], output_file: Path):
-    """Generate a comprehensive report of all fixes."""
-    report = []
+def generate_report(run: RepairRun, output_file: Path, full: bool = False, compress: bool = False) -> Path:
+    """
+    Stream a comprehensive report of all fixes to output_file, plus a JSON page index.
+    Unless `full`, lists are truncated (50 files, 10 fixes per file, 100 unfixable links).
+    Returns: path of the index
+    """
+    stats, log = run.stats, run.log
+    modified_files = log.modified
+    paths, urls = log.tables.paths, log.tables.urls
+    if full:
+        pattern_limit = file_limit = fix_limit = unfixable_limit = None
+    else:
+        pattern_limit, file_limit, fix_limit, unfixable_limit = 20, 50, 10, 100
+
+    with ReportWriter(output_file, compress=compress, metadata={'stats': stats, 'full': full}) as writer:
+        writer.write("# Link Repair Report - Phase 3",
+                     "",
+                     f"**Date:** {os.popen('date').read().strip()}",
+                     f"**Agent:** Link Repair Agent",
+                     "")
+
+        summary = [
+            f"- **Files Scanned:** {stats['total_files_scanned']}",
+            f"- **Total Links Found:** {stats['total_links_found']}",
+            f"- **Broken Links Found:** {stats['broken_links_found']}",
+            f"- **Links Fixed:** {stats['links_fixed']}",
+            f"- **Links Unfixable:** {stats['links_unfixable']}",
+            f"- **Files Modified:** {stats['files_modified']}",
+            "",
+        ]
+        if stats['broken_links_found'] > 0:
+            fix_rate = (stats['links_fixed'] / stats['broken_links_found']) * 100
+            summary.append(f"**Fix Rate:** {fix_rate:.1f}%")
+            remaining = stats['broken_links_found'] - stats['links_fixed']
+            summary.append(f"**Remaining Broken Links:** {remaining}")
+        summary.append("")
+        writer.section("Executive Summary", *summary)
+
+        writer.section("Top Fix Patterns")
+        sorted_patterns = sorted(run.fixes_by_pattern.items(), key=lambda x: x[1], reverse=True)
+        for pattern, count in sorted_patterns[:pattern_limit]:
+            writer.entry(pattern, [f"- **{count}x** {pattern}"])
+        writer.write("")
+
+        writer.section("Files Modified", f"Total: {len(modified_files)} files", "")
+        for file_info in sorted(modified_files, key=lambda x: x.count, reverse=True)[:file_limit]:
+            fixes = log.fixes_for(file_info)[:fix_limit]
+            lines = [f"### {paths[file_info.file]}", f"**Fixes:** {file_info.count}", ""]
+            lines.extend(f"- `{urls[fix.old]}` → `{urls[fix.new]}`" for fix in fixes)
+            if file_info.count > len(fixes):
+                lines.append(f"- ... and {file_info.count - len(fixes)} more")
+            lines.append("")
+            writer.entry(paths[file_info.file], lines)
+
+        if file_limit is not None and len(modified_files) > file_limit:
+            writer.write(f"\n... and {len(modified_files) - file_limit} more files\n")
+
+        unfixable_links = log.unfixable
+        writer.section("Unfixable Links", f"Total: {len(unfixable_links)}", "")
+
+        # Records are logged file by file, so each file's links are already adjacent
+        if unfixable_limit is None:
+            items = unfixable_links
+        else:
+            items = sorted(unfixable_links[:unfixable_limit], key=lambda item: paths[item.file])
+        for file_id, group in groupby(items, key=lambda item: item.file):
+            lines = [f"### {paths[file_id]}"]
+            for item in group:
+                lines.append(f"- `{urls[item.url]}`")
+                if item.attempted < 0:
+                    lines.append(f"  - Reason: {NO_CANDIDATES_REASON}")
+                else:
+                    lines.append(f"  - Attempted: `{urls[item.attempted]}` (still broken)")
+            lines.append("")
+            writer.entry(paths[file_id], lines)
 
-    report.append("# Link Repair Report - Phase 3")
-    report.append("")
-    report.append(f"**Date:** {os.popen('date').read().strip()}")
-    report.append(f"**Agent:** Link Repair Agent")
-    report.append("")
+        if unfixable_limit is not None and len(unfixable_links) > unfixable_limit:
+            writer.write(f"\n... and {len(unfixable_links) - unfixable_limit} more unfixable links\n")
 
-    report.append("## Executive Summary")
-    report.append("")
-    report.append(f"- **Files Scanned:** {stats['total_files_scanned']}")
-    report.append(f"- **Total Links Found:** {stats['total_links_found']}")
-    report.append(f"- **Broken Links Found:** {stats['broken_links_found']}")
-    report.append(f"- **Links Fixed:** {stats['links_fixed']}")
-    report.append(f"- **Links Unfixable:** {stats['links_unfixable']}")
-    report.append(f"- **Files Modified:** {stats['files_modified']}")
-    report.append("")
+        if run.read_diagnostics:
+            writer.section("Read Diagnostics")
+            for item in run.read_diagnostics:
+                writer.entry(item['file'], [f"- `{item['file']}`: {item['message']}"])
+            writer.write("")
 
-    if stats['broken_links_found'] > 0:
-        fix_rate = (stats['links_fixed'] / stats['broken_links_found']) * 100
-        report.append(f"**Fix Rate:** {fix_rate:.1f}%")
-        remaining = stats['broken_links_found'] - stats['links_fixed']
-        report.append(f"**Remaining Broken Links:** {remaining}")
-    report.append("")
-
-    report.append("## Top Fix Patterns")
-    report.append("")
-    sorted_patterns = sorted(fixes_by_pattern.items(), key=lambda x: x[1], reverse=True)
-    for pattern, count in sorted_patterns[:20]:
-        report.append(f"- **{count}x** {pattern}")
-    report.append("")
-
-    report.append("## Files Modified")
-    report.append("")
-    report.append(f"Total: {len(modified_files)} files")
-    report.append("")
-
-    for file_info in sorted(modified_files, key=lambda x: x['count'], reverse=True)[:50]:
-        report.append(f"### {file_info['file']}")
-        report.append(f"**Fixes:** {file_info['count']}")
-        report.append("")
-        for fix in file_info['fixes'][:10]:  # Show first 10 fixes per file
-            report.append(f"- `{fix['old']}` → `{fix['new']}`")
-        if len(file_info['fixes']) > 10:
-            report.append(f"- ... and {len(file_info['fixes']) - 10} more")
-        report.append("")
-
-    if len(modified_files) > 50:
-        report.append(f"\n... and {len(modified_files) - 50} more files\n")
-
-    report.append("## Unfixable Links")
-    report.append("")
-    report.append(f"Total: {len(unfixable_links)}")
-    report.append("")
-
-    # Group by file
-    unfixable_by_file = defaultdict(list)
-    for item in unfixable_links[:100]:  # Limit to first 100
-        unfixable_by_file[item['file']].append(item)
-
-    for file_path, items in sorted(unfixable_by_file.items()):
-        report.append(f"### {file_path}")
-        for item in items:
-            report.append(f"- `{item['link']}`")
-            if 'reason' in item:
-                report.append(f"  - Reason: {item['reason']}")
-            elif 'attempted_fix' in item:
-                report.append(f"  - Attempted: `{item['attempted_fix']}` (still broken)")
-        report.append("")
-
-    if len(unfixable_links) > 100:
-        report.append(f"\n... and {len(unfixable_links) - 100} more unfixable links\n")
-
-    # Write report
-    output_file.write_text('\n'.join(report), encoding='utf-8')
     print(f"\nReport written to: {output_file}")
+    print(f"Report index written to: {writer.index_path}")
+    return writer.index_path
 
 
 def main():
@@ -391,7 +501,15 @@ def main():
 
     parser = argparse.ArgumentParser(description='Fix broken internal links in documentation')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be fixed without making changes')
+    parser.add_argument('--root', type=Path, default=BASE_DIR, help='Repository root to repair')
     parser.add_argument('--report', default='link_repair_report.md', help='Report output file')
+    parser.add_argument('--full-report', action='store_true',
+                        help='List every modified file, fix and unfixable link in the report')
+    parser.add_argument('--gzip', action='store_true', help='Write the report gzip-compressed')
+    parser.add_argument('--no-dedupe', action='store_true',
+                        help='Skip near-duplicate detection when ranking candidates')
+    parser.add_argument('--mmap', action='store_true',
+                        help='Scan memory-mapped bytes, decoding only matched links')
     args = parser.parse_args()
 
     print("=" * 80)
@@ -399,15 +517,22 @@ def main():
     print("Restaurant OS Documentation Link Repair")
     print("=" * 80)
 
+    run = RepairRun(args.root)
+    stats = run.stats
+
     # Build file cache
-    build_file_cache()
+    build_file_cache(run)
+    if not args.no_dedupe:
+        build_duplicate_index(run)
 
     # Process all files
-    modified_files = process_all_files(dry_run=args.dry_run)
+    process_all_files(run, dry_run=args.dry_run, use_mmap=args.mmap)
 
     # Generate report
-    report_path = BASE_DIR / args.report
-    generate_report(modified_files, report_path)
+    report_path = run.root / args.report
+    if args.gzip and report_path.suffix != '.gz':
+        report_path = report_path.with_name(report_path.name + '.gz')
+    generate_report(run, report_path, full=args.full_report, compress=args.gzip)
 
     # Print summary
     print("\n" + "=" * 80)
@@ -419,6 +544,8 @@ def main():
     print(f"Links fixed:         {stats['links_fixed']}")
     print(f"Links unfixable:     {stats['links_unfixable']}")
     print(f"Files modified:      {stats['files_modified']}")
+    if run.read_diagnostics:
+        print(f"Read diagnostics:    {len(run.read_diagnostics)}")
 
     if stats['broken_links_found'] > 0:
         fix_rate = (stats['links_fixed'] / stats['broken_links_found']) * 100
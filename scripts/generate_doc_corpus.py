@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Synthetic Documentation Corpus Generator
+Writes a docs tree shaped like an aggregation of many repositories, for
+benchmarking the link tools without checking out real repos.
+
+Layout:
+    <out>/README.md
+    <out>/docs/<repo>/<section>/<topic>-<n>.md
+
+Every repository reuses the same file names, so the repair tool sees many
+candidates per name, as it would in an aggregated tree. Links point at other
+documents in the same repository; a share of them is broken, either by
+pointing into the wrong directory (fixable) or at a name that does not exist
+(unfixable).
+"""
+
+import os
+import random
+from pathlib import Path
+from typing import Dict
+
+SECTIONS = ('how-to', 'reference', 'explanation', 'tutorials', 'archive')
+TOPICS = ('guide', 'api', 'deploy', 'auth', 'config', 'testing', 'runbook', 'overview')
+LINK_TEXTS = ('See also', 'Reference', 'Setup guide', 'API docs', 'Details', 'Runbook',
+              'Architecture', 'Troubleshooting')
+FILLER = ("The service reads its configuration at start-up and reconnects on failure. "
+          "Operators should review the checklist before each deployment.")
+
+
+def doc_paths(repo_dir: Path, docs_per_repo: int):
+    for n in range(docs_per_repo):
+        section = SECTIONS[n % len(SECTIONS)]
+        topic = TOPICS[(n // len(SECTIONS)) % len(TOPICS)]
+        yield repo_dir / section / f"{topic}-{n}.md"
+
+
+def generate_corpus(out: Path, repos: int = 50, docs_per_repo: int = 100, links_per_doc: int = 20,
+                    broken_ratio: float = 0.25, seed: int = 0) -> Dict[str, int]:
+    """Write the corpus under out and return file/link counts."""
+    rng = random.Random(seed)
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    (out / 'README.md').write_text("# Aggregated Docs\n\nSynthetic corpus.\n", encoding='utf-8')
+
+    counts = {'files': 1, 'links': 0, 'broken': 0}
+    for r in range(repos):
+        repo_dir = out / 'docs' / f"repo-{r:04d}"
+        paths = list(doc_paths(repo_dir, docs_per_repo))
+        for directory in {path.parent for path in paths}:
+            directory.mkdir(parents=True, exist_ok=True)
+
+        for path in paths:
+            lines = [f"# {path.stem.replace('-', ' ').title()}", "", FILLER, ""]
+            for _ in range(links_per_doc):
+                target = rng.choice(paths)
+                url = os.path.relpath(target, path.parent)
+                if rng.random() < broken_ratio:
+                    counts['broken'] += 1
+                    if rng.random() < 0.5:
+                        url = f"../moved/{target.name}"
+                    else:
+                        url = f"missing-{rng.randrange(1000)}.md"
+                if rng.random() < 0.2:
+                    url += "#overview"
+                lines.append(f"- [{rng.choice(LINK_TEXTS)}]({url})")
+            lines.append("")
+            path.write_text('\n'.join(lines), encoding='utf-8')
+            counts['files'] += 1
+            counts['links'] += links_per_doc
+    return counts
+
+
+def main():
+    """Main execution function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate a synthetic aggregated docs tree')
+    parser.add_argument('out', type=Path, help='Output directory')
+    parser.add_argument('--repos', type=int, default=50, help='Number of repositories')
+    parser.add_argument('--docs', type=int, default=100, help='Documents per repository')
+    parser.add_argument('--links', type=int, default=20, help='Links per document')
+    parser.add_argument('--broken-ratio', type=float, default=0.25, help='Share of broken links')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    counts = generate_corpus(args.out, repos=args.repos, docs_per_repo=args.docs,
+                             links_per_doc=args.links, broken_ratio=args.broken_ratio, seed=args.seed)
+    print(f"Wrote {counts['files']} files with {counts['links']} links "
+          f"({counts['broken']} broken) to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
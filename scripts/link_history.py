@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Link Health History
+Appends the results of each link check to a local SQLite database and answers
+questions about them without re-running the validator on old checkouts.
+
+Each run stores its commit SHA, branch, timestamp, totals, per-file counts
+and one row per broken link. Files, urls, commits and branches are indexed.
+Queries only look at runs from one branch, so interleaved runs from feature
+branches do not show up as breakages and fixes. Runs are recorded and
+queried under the same branch name (see current_branch): a detached HEAD,
+as when backfilling old commits, counts as --default-branch (main).
+
+Usage:
+    python scripts/validate_links.py --history .cache/link-history.sqlite
+    python scripts/link_history.py record
+    python scripts/link_history.py health [--file docs/README.md] [--branch main]
+    python scripts/link_history.py first-broken ../guide.md [--file docs/README.md] [--root .]
+    python scripts/link_history.py top-files [--branch main]
+"""
+
+import os
+import sqlite3
+import subprocess
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from validate_links import BASE_DIR, Report, check_links
+
+DEFAULT_DB = BASE_DIR / ".cache" / "link-history.sqlite"
+DEFAULT_BRANCH = "main"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    commit_sha TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    branch TEXT,
+    files INTEGER NOT NULL,
+    total_links INTEGER NOT NULL,
+    valid_links INTEGER NOT NULL,
+    broken_links INTEGER NOT NULL,
+    health REAL
+);
+CREATE TABLE IF NOT EXISTS file_results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    file TEXT NOT NULL,
+    links INTEGER NOT NULL,
+    valid INTEGER NOT NULL,
+    broken INTEGER NOT NULL,
+    PRIMARY KEY (run_id, file)
+);
+CREATE TABLE IF NOT EXISTS broken_links (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    file TEXT NOT NULL,
+    url TEXT NOT NULL,
+    link_text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_commit ON runs(commit_sha);
+CREATE INDEX IF NOT EXISTS idx_runs_branch ON runs(branch, id);
+CREATE INDEX IF NOT EXISTS idx_file_results_file ON file_results(file, run_id);
+CREATE INDEX IF NOT EXISTS idx_broken_links_file ON broken_links(file, run_id);
+CREATE INDEX IF NOT EXISTS idx_broken_links_url ON broken_links(url, file, run_id);
+CREATE INDEX IF NOT EXISTS idx_broken_links_run ON broken_links(run_id);
+"""
+
+
+def git_value(root: Path, *args: str) -> Optional[str]:
+    try:
+        result = subprocess.run(['git', *args], cwd=root, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def current_commit(root: Path) -> str:
+    """GITHUB_SHA in CI, otherwise HEAD of the checkout."""
+    return os.environ.get('GITHUB_SHA') or git_value(root, 'rev-parse', 'HEAD') or 'unknown'
+
+
+def current_branch(root: Path, default: str = DEFAULT_BRANCH) -> str:
+    """
+    Branch runs of root are recorded and queried under. GITHUB_HEAD_REF /
+    GITHUB_REF_NAME in CI, otherwise the checked-out branch; a detached HEAD
+    (e.g. an old commit checked out for backfilling) or a tree outside git
+    maps to default, so 'HEAD' is never stored.
+    """
+    branch = (os.environ.get('GITHUB_HEAD_REF') or os.environ.get('GITHUB_REF_NAME')
+              or git_value(root, 'rev-parse', '--abbrev-ref', 'HEAD'))
+    return branch if branch and branch != 'HEAD' else default
+
+
+def branch_filter(branch: Optional[str], column: str = 'branch'):
+    """(SQL condition, params) restricting column to branch; no-op for None (all branches)."""
+    if branch is None:
+        return '1', ()
+    return f'{column} = ?', (branch,)
+
+
+class LinkHistory:
+    """SQLite store of link check runs; runs are ordered by insertion."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, report: Report, commit: str, branch: Optional[str] = None,
+               recorded_at: Optional[str] = None) -> int:
+        """Append one run; returns its id."""
+        recorded_at = recorded_at or datetime.now(timezone.utc).isoformat(timespec='seconds')
+        with self.conn:
+            run_id = self.conn.execute(
+                "INSERT INTO runs (commit_sha, recorded_at, branch, files, total_links, valid_links,"
+                " broken_links, health) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (commit, recorded_at, branch, report.total_files, report.total_links,
+                 report.valid_links, report.broken_count, report.health)).lastrowid
+            self.conn.executemany(
+                "INSERT INTO file_results (run_id, file, links, valid, broken) VALUES (?, ?, ?, ?, ?)",
+                ((run_id, f.file, f.links, f.valid, f.broken) for f in report.files))
+            self.conn.executemany(
+                "INSERT INTO broken_links (run_id, file, url, link_text) VALUES (?, ?, ?, ?)",
+                ((run_id, link.file, link.link_url, link.link_text)
+                 for f in report.files if f.broken for link in f.broken_list))
+        return run_id
+
+    def health(self, limit: int = 30, file: Optional[str] = None,
+               branch: Optional[str] = None) -> List[sqlite3.Row]:
+        """Most recent runs on branch (None: all), oldest first; per-file counts when file is given."""
+        on_branch, branch_params = branch_filter(branch, 'r.branch')
+        if file is None:
+            rows = self.conn.execute(
+                "SELECT id, commit_sha, recorded_at, total_links, broken_links, health"
+                f" FROM runs r WHERE {on_branch} ORDER BY id DESC LIMIT ?",
+                (*branch_params, limit)).fetchall()
+        else:
+            rows = self.conn.execute(
+                "SELECT r.id, r.commit_sha, r.recorded_at, f.links AS total_links,"
+                " f.broken AS broken_links,"
+                " CASE WHEN f.links > 0 THEN 100.0 * f.valid / f.links END AS health"
+                " FROM file_results f JOIN runs r ON r.id = f.run_id"
+                f" WHERE f.file = ? AND {on_branch} ORDER BY f.run_id DESC LIMIT ?",
+                (file, *branch_params, limit)).fetchall()
+        return rows[::-1]
+
+    def first_broken(self, url: str, file: Optional[str] = None,
+                     branch: Optional[str] = None) -> List[Dict]:
+        """
+        For each file where url was recorded broken on branch (None: all): the
+        run that started its latest broken streak, and the last run before it
+        where the link was not broken.
+        """
+        on_branch, branch_params = branch_filter(branch, 'r.branch')
+        if file is None:
+            files = [row['file'] for row in self.conn.execute(
+                "SELECT DISTINCT b.file FROM broken_links b JOIN runs r ON r.id = b.run_id"
+                f" WHERE b.url = ? AND {on_branch}", (url, *branch_params))]
+        else:
+            files = [file]
+
+        latest_run = self.conn.execute(
+            f"SELECT MAX(id) FROM runs r WHERE {on_branch}", branch_params).fetchone()[0]
+        results = []
+        for name in files:
+            latest_broken = self.conn.execute(
+                "SELECT MAX(b.run_id) FROM broken_links b JOIN runs r ON r.id = b.run_id"
+                f" WHERE b.url = ? AND b.file = ? AND {on_branch}",
+                (url, name, *branch_params)).fetchone()[0]
+            if latest_broken is None:
+                continue
+            last_good = self.conn.execute(
+                f"SELECT MAX(id) FROM runs r WHERE {on_branch} AND id < ? AND id NOT IN"
+                " (SELECT run_id FROM broken_links WHERE url = ? AND file = ?)",
+                (*branch_params, latest_broken, url, name)).fetchone()[0]
+            first = self.conn.execute(
+                "SELECT r.id, r.commit_sha, r.recorded_at FROM broken_links b"
+                " JOIN runs r ON r.id = b.run_id"
+                f" WHERE b.url = ? AND b.file = ? AND b.run_id > ? AND {on_branch}"
+                " ORDER BY b.run_id LIMIT 1",
+                (url, name, last_good or 0, *branch_params)).fetchone()
+            previous = self.conn.execute(
+                "SELECT commit_sha FROM runs WHERE id = ?", (last_good,)).fetchone()
+            results.append({
+                'file': name,
+                'commit': first['commit_sha'],
+                'recorded_at': first['recorded_at'],
+                'previous_commit': previous['commit_sha'] if previous else None,
+                'still_broken': latest_broken == latest_run,
+            })
+        return results
+
+    def top_files(self, limit: int = 20, runs: Optional[int] = None,
+                  branch: Optional[str] = None) -> List[sqlite3.Row]:
+        """
+        Files with broken links in the most runs on branch (None: all),
+        optionally only the last `runs` runs.
+        """
+        on_branch, branch_params = branch_filter(branch, 'r.branch')
+        min_run = 0
+        if runs is not None:
+            row = self.conn.execute(
+                f"SELECT MIN(id) FROM (SELECT id FROM runs r WHERE {on_branch} ORDER BY id DESC LIMIT ?)",
+                (*branch_params, runs)).fetchone()
+            min_run = row[0] or 0
+        return self.conn.execute(
+            "SELECT f.file, COUNT(*) AS runs_broken, MAX(f.broken) AS max_broken,"
+            " (SELECT COUNT(DISTINCT b.url) FROM broken_links b JOIN runs r ON r.id = b.run_id"
+            f"  WHERE b.file = f.file AND b.run_id >= ? AND {on_branch}) AS distinct_urls"
+            " FROM file_results f JOIN runs r ON r.id = f.run_id"
+            f" WHERE f.broken > 0 AND f.run_id >= ? AND {on_branch}"
+            " GROUP BY f.file ORDER BY runs_broken DESC, max_broken DESC, f.file LIMIT ?",
+            (min_run, *branch_params, min_run, *branch_params, limit)).fetchall()
+
+
+def record_report(db_path: Path, report: Report, commit: Optional[str] = None,
+                  default_branch: str = DEFAULT_BRANCH) -> int:
+    """Append report to the history database at db_path; returns the run id."""
+    with closing(LinkHistory(db_path)) as history:
+        return history.record(report, commit or current_commit(report.root),
+                              current_branch(report.root, default_branch))
+
+
+def main():
+    """Main execution function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Query and record link health history')
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB, help='History database')
+    parser.add_argument('--default-branch', default=DEFAULT_BRANCH,
+                        help=f'Branch for runs on a detached HEAD or outside git (default: {DEFAULT_BRANCH})')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    record = sub.add_parser('record', help='Run the link validator and append the results')
+    record.add_argument('--root', type=Path, default=BASE_DIR, help='Repository root to scan')
+    record.add_argument('--commit', default=None, help='Commit SHA (default: GITHUB_SHA or git HEAD)')
+
+    health = sub.add_parser('health', help='Link health over time')
+    health.add_argument('--file', default=None, help='Only this file (path relative to the root)')
+    health.add_argument('--limit', type=int, default=30, help='Number of most recent runs')
+
+    first = sub.add_parser('first-broken', help='Commit that first broke a link')
+    first.add_argument('url', help='Link target exactly as written in the markdown')
+    first.add_argument('--file', default=None, help='Only this source file')
+
+    top = sub.add_parser('top-files', help='Files that break most often')
+    top.add_argument('--limit', type=int, default=20, help='Number of files')
+    top.add_argument('--runs', type=int, default=None, help='Only the most recent N runs')
+
+    for query in (health, first, top):
+        query.add_argument('--root', type=Path, default=BASE_DIR,
+                           help='Checkout whose branch is queried by default')
+        query.add_argument('--branch', default=None,
+                           help="Only runs recorded on this branch (default: the root's branch, as record stores it)")
+        query.add_argument('--all-branches', action='store_true', help='Include runs from every branch')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        report = check_links(args.root)
+        run_id = record_report(args.db, report, args.commit, args.default_branch)
+        health_text = f"{report.health:.1f}%" if report.health is not None else "n/a"
+        print(f"Recorded run {run_id}: {report.broken_count} broken links, health {health_text}")
+        return 0
+
+    branch = None if args.all_branches else args.branch or current_branch(args.root, args.default_branch)
+    with closing(LinkHistory(args.db)) as history:
+        if args.command == 'health':
+            rows = history.health(limit=args.limit, file=args.file, branch=branch)
+            print(f"{'Run':>5} {'Commit':<10} {'Recorded':<26} {'Links':>6} {'Broken':>7} Health")
+            for row in rows:
+                health_text = f"{row['health']:.1f}%" if row['health'] is not None else "n/a"
+                print(f"{row['id']:>5} {row['commit_sha'][:10]:<10} {row['recorded_at']:<26} "
+                      f"{row['total_links']:>6} {row['broken_links']:>7} {health_text}")
+
+        elif args.command == 'first-broken':
+            results = history.first_broken(args.url, file=args.file, branch=branch)
+            if not results:
+                print(f"{args.url} was never recorded as broken")
+                return 1
+            for item in results:
+                state = "still broken" if item['still_broken'] else "since fixed"
+                since = f" (last good: {item['previous_commit'][:10]})" if item['previous_commit'] else ""
+                print(f"{item['file']}: broken in {item['commit'][:10]} at {item['recorded_at']}{since}, {state}")
+
+        elif args.command == 'top-files':
+            rows = history.top_files(limit=args.limit, runs=args.runs, branch=branch)
+            print(f"{'Runs broken':>11} {'Max':>4} {'URLs':>5}  File")
+            for row in rows:
+                print(f"{row['runs_broken']:>11} {row['max_broken']:>4} {row['distinct_urls']:>5}  {row['file']}")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,117 @@
+"""
+Compact per-link result storage for the link tools.
+
+A docs tree aggregated from many repositories yields hundreds of thousands of
+link results that repeat the same file paths, urls and link texts. Instead of
+a dict per link, each distinct string is stored once in a `StringTable` and
+records hold only its integer id, so a link costs a slotted object of a few
+ints. Reports decode ids back to strings only for the lines they print.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+class StringTable:
+    """Append-only table that interns strings to dense integer ids."""
+
+    __slots__ = ('_ids', 'values')
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def intern(self, value: str) -> int:
+        # Ids come from the dict, so records share one int object per string
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return string_id
+
+    def __getitem__(self, string_id: int) -> str:
+        return self.values[string_id]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class LinkTables:
+    """Interned file paths, link texts and urls shared by every record of a run."""
+
+    __slots__ = ('paths', 'texts', 'urls')
+
+    def __init__(self):
+        self.paths = StringTable()
+        self.texts = StringTable()
+        self.urls = StringTable()
+
+
+@dataclass(frozen=True, slots=True)
+class LinkRecord:
+    """A link inside a file that is known from context."""
+    text: int
+    url: int
+
+
+@dataclass(frozen=True, slots=True)
+class FixRecord:
+    """A repaired link: `old` url replaced by `new`."""
+    file: int
+    text: int
+    old: int
+    new: int
+
+
+@dataclass(frozen=True, slots=True)
+class UnfixableRecord:
+    """A broken link with no verified fix; `attempted` is -1 when no candidate existed."""
+    file: int
+    url: int
+    attempted: int = -1
+
+
+@dataclass(frozen=True, slots=True)
+class ModifiedFile:
+    """A repaired file: its fixes are `count` consecutive entries of the fix log from `start`."""
+    file: int
+    start: int
+    count: int
+
+
+class RepairLog:
+    """Fixes and unfixable links of a repair run, stored as interned records."""
+
+    __slots__ = ('tables', 'fixes', 'unfixable', 'modified')
+
+    def __init__(self, tables: Optional[LinkTables] = None):
+        self.tables = tables or LinkTables()
+        self.fixes: List[FixRecord] = []
+        self.unfixable: List[UnfixableRecord] = []
+        self.modified: List[ModifiedFile] = []
+
+    def add_fix(self, file: str, text: str, old: str, new: str) -> FixRecord:
+        tables = self.tables
+        record = FixRecord(tables.paths.intern(file), tables.texts.intern(text),
+                           tables.urls.intern(old), tables.urls.intern(new))
+        self.fixes.append(record)
+        return record
+
+    def add_unfixable(self, file: str, url: str, attempted: Optional[str] = None) -> UnfixableRecord:
+        tables = self.tables
+        record = UnfixableRecord(tables.paths.intern(file), tables.urls.intern(url),
+                                 -1 if attempted is None else tables.urls.intern(attempted))
+        self.unfixable.append(record)
+        return record
+
+    def mark_modified(self, file: str, start: int) -> Optional[ModifiedFile]:
+        """Record that fixes[start:] belong to file; no-op when there are none."""
+        count = len(self.fixes) - start
+        if count <= 0:
+            return None
+        record = ModifiedFile(self.tables.paths.intern(file), start, count)
+        self.modified.append(record)
+        return record
+
+    def fixes_for(self, modified: ModifiedFile) -> List[FixRecord]:
+        return self.fixes[modified.start:modified.start + modified.count]
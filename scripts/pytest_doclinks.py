@@ -0,0 +1,114 @@
+"""
+Pytest plugin for in-process documentation link checks.
+
+Each markdown file becomes a test module. A file with no broken links yields
+one passing `links` item; every broken link becomes its own failing item, so
+CI output names the exact link that needs fixing. A file that could not be
+read or decoded fails with one `read` item per diagnostic.
+
+Usage:
+    PYTHONPATH=scripts python -m pytest -p pytest_doclinks --doclinks docs
+
+The plugin also provides a session-scoped `doclinks` fixture: a warm
+`LinkChecker` shared by every test in the session, e.g.
+
+    def test_runbooks_links(doclinks):
+        assert doclinks.check([Path("docs/RUNBOOKS.md")]).ok
+"""
+
+from pathlib import Path
+
+import pytest
+
+from validate_links import LinkChecker, is_ignored
+
+_CHECKER_KEY = pytest.StashKey[LinkChecker]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("doclinks", "documentation link checks")
+    group.addoption("--doclinks", action="store_true", default=False,
+                    help="Collect markdown files and check their internal links")
+    group.addoption("--doclinks-root", default=None,
+                    help="Root that links are resolved against (default: pytest rootdir)")
+
+
+def get_checker(config) -> LinkChecker:
+    """Return the session-wide checker, creating it on first use."""
+    checker = config.stash.get(_CHECKER_KEY, None)
+    if checker is None:
+        root = config.getoption("--doclinks-root") or config.rootpath
+        checker = config.stash[_CHECKER_KEY] = LinkChecker(Path(root))
+    return checker
+
+
+@pytest.fixture(scope="session")
+def doclinks(pytestconfig) -> LinkChecker:
+    return get_checker(pytestconfig)
+
+
+def pytest_collect_file(file_path: Path, parent):
+    if not parent.config.getoption("--doclinks"):
+        return None
+    if file_path.suffix.lower() != ".md":
+        return None
+    if is_ignored(file_path, get_checker(parent.config).root):
+        return None
+    return MarkdownLinksFile.from_parent(parent, path=file_path)
+
+
+class BrokenLinkError(Exception):
+    pass
+
+
+class ReadDiagnosticError(Exception):
+    pass
+
+
+class MarkdownLinksFile(pytest.File):
+    def collect(self):
+        result = get_checker(self.config).check_file(self.path)
+        for index, message in enumerate(result.diagnostics):
+            yield DiagnosticItem.from_parent(self, name=f"read[{index}]", message=message)
+        if not result.broken_list:
+            if not result.diagnostics:
+                yield LinkItem.from_parent(self, name="links", link=None)
+            return
+        for index, link in enumerate(result.broken_list):
+            yield LinkItem.from_parent(self, name=f"[{index}]{link.link_url}", link=link)
+
+
+class LinkItem(pytest.Item):
+    def __init__(self, *, link, **kwargs):
+        super().__init__(**kwargs)
+        self.link = link
+
+    def runtest(self):
+        if self.link is not None:
+            raise BrokenLinkError(self.link)
+
+    def repr_failure(self, excinfo):
+        if isinstance(excinfo.value, BrokenLinkError):
+            link = self.link
+            return f"{link.file}: broken link [{link.link_text}]({link.link_url})"
+        return super().repr_failure(excinfo)
+
+    def reportinfo(self):
+        return self.path, None, f"doclinks: {self.name}"
+
+
+class DiagnosticItem(pytest.Item):
+    def __init__(self, *, message, **kwargs):
+        super().__init__(**kwargs)
+        self.message = message
+
+    def runtest(self):
+        raise ReadDiagnosticError(self.message)
+
+    def repr_failure(self, excinfo):
+        if isinstance(excinfo.value, ReadDiagnosticError):
+            return f"{get_checker(self.config).relative(self.path)}: {self.message}"
+        return super().repr_failure(excinfo)
+
+    def reportinfo(self):
+        return self.path, None, f"doclinks: {self.name}"
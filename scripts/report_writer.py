@@ -0,0 +1,144 @@
+"""
+Streaming markdown report writer with a JSON page index.
+
+Reports are written section by section as they are produced, in pages of at
+most `page_size` entries. Each page is flushed to disk when it closes, so
+memory use and time-to-first-byte do not grow with the size of the report.
+
+A companion `<name>.index.json` lists every section and page with its byte
+offset and length, so a reader can fetch one page without loading the rest:
+
+    text = read_page(Path("link_repair_report.index.json"), 12)
+
+With gzip, every page is written as its own gzip member. Concatenated members
+form a valid .gz file, and the offsets in the index point at member
+boundaries, so a single page can also be decompressed on its own.
+"""
+
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Entries (e.g. modified files) per page
+PAGE_SIZE = 100
+
+
+def index_path_for(report_path: Path) -> Path:
+    name = report_path.name
+    for suffix in ('.gz', '.md'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return report_path.with_name(name + '.index.json')
+
+
+class ReportWriter:
+    """
+    Incremental markdown writer; use as a context manager or call close().
+
+    `metadata` (e.g. run statistics) is stored in the index. Leaving the
+    context always closes the report and writes the index, also when the body
+    raised; the index then records `"complete": false`.
+    """
+
+    def __init__(self, path: Path, compress: bool = False, page_size: int = PAGE_SIZE,
+                 metadata: Optional[Dict] = None):
+        self.path = Path(path)
+        self.index_path = index_path_for(self.path)
+        self.compress = compress
+        self.page_size = page_size
+        self.metadata: Dict = dict(metadata or {})
+        self.sections: List[Dict] = []
+        self.pages: List[Dict] = []
+        self._raw = open(self.path, 'wb')
+        self._gzip: Optional[gzip.GzipFile] = None
+        self._page: Optional[Dict] = None
+        self._uncompressed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(complete=exc_type is None)
+
+    def _open_page(self):
+        self._page = {
+            'page': len(self.pages),
+            'section': len(self.sections) - 1,
+            'offset': self._raw.tell(),
+            'uncompressed_offset': self._uncompressed,
+            'entries': 0,
+            'first': None,
+            'last': None,
+        }
+        if self.compress:
+            self._gzip = gzip.GzipFile(fileobj=self._raw, mode='wb', mtime=0)
+
+    def _close_page(self):
+        if self._page is None:
+            return
+        if self._gzip is not None:
+            self._gzip.close()  # ends the member; the underlying file stays open
+            self._gzip = None
+        self._raw.flush()
+        self._page['length'] = self._raw.tell() - self._page['offset']
+        self.pages.append(self._page)
+        self._page = None
+
+    def write(self, *lines: str):
+        """Write lines (newline-terminated) to the current page."""
+        if self._page is None:
+            self._open_page()
+        data = ''.join(line + '\n' for line in lines).encode('utf-8')
+        (self._gzip or self._raw).write(data)
+        self._uncompressed += len(data)
+
+    def section(self, title: str, *lines: str):
+        """Start a new section (and page) with a `## title` heading."""
+        self._close_page()
+        self.sections.append({'title': title, 'first_page': len(self.pages)})
+        self.write(f"## {title}", "", *lines)
+
+    def entry(self, key: str, lines: Iterable[str]):
+        """Write one pageable entry (e.g. a file's fixes) identified by key."""
+        if self._page is not None and self._page['entries'] >= self.page_size:
+            self._close_page()
+        self.write(*lines)
+        page = self._page
+        page['entries'] += 1
+        if page['first'] is None:
+            page['first'] = key
+        page['last'] = key
+
+    def close(self, **metadata):
+        """Finish the report and write the index; metadata is added to the constructor's."""
+        if self._raw.closed:
+            return
+        self.metadata.update(metadata)
+        self.metadata.setdefault('complete', True)
+        try:
+            self._close_page()
+        finally:
+            self._raw.close()
+        index = {
+            'report': self.path.name,
+            'gzip': self.compress,
+            'page_size': self.page_size,
+            'bytes': self._uncompressed,
+            'sections': self.sections,
+            'pages': self.pages,
+            **self.metadata,
+        }
+        self.index_path.write_text(json.dumps(index, indent=2), encoding='utf-8')
+
+
+def read_page(index_path: Path, page: int) -> str:
+    """Text of one page of a report, read through its index."""
+    index = json.loads(Path(index_path).read_text(encoding='utf-8'))
+    entry = index['pages'][page]
+    with open(Path(index_path).with_name(index['report']), 'rb') as f:
+        f.seek(entry['offset'])
+        data = f.read(entry['length'])
+    if index['gzip']:
+        data = gzip.decompress(data)
+    return data.decode('utf-8')
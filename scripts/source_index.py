@@ -0,0 +1,198 @@
+"""
+Persistent per-file extraction cache for the documentation drift checkers.
+
+Each checker extracts a small JSON-serializable summary from every source
+file (routes, env vars, socket events, ...). Summaries are stored under
+.cache/doc-tools/<name>.json keyed by the file's content hash; a file whose
+size and mtime are unchanged is not even re-hashed, so repeated runs only do
+work for files that actually changed.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from validate_links import BASE_DIR
+
+CACHE_DIR_NAME = Path(".cache") / "doc-tools"
+
+# Below this many cache misses, process start-up costs more than it saves
+PARALLEL_THRESHOLD = 32
+
+
+def file_digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _read_and_extract(extractor: Callable[[str], Any], path: Path,
+                      known_sha: Optional[str]) -> Tuple[str, Any]:
+    """
+    Read, hash and extract path; runs in the worker processes.
+    Returns (sha, result), with result None when sha equals known_sha.
+    """
+    data = path.read_bytes()
+    digest = file_digest(data)
+    if digest == known_sha:
+        return digest, None
+    return digest, extractor(data.decode('utf-8', errors='replace'))
+
+
+class SourceIndexCache:
+    """
+    JSON-backed cache of per-file extraction results.
+
+    `version` should change whenever the extractor's output format changes;
+    a mismatched cache file is discarded on load.
+    """
+
+    def __init__(self, name: str, version: int, root: Path = BASE_DIR, enabled: bool = True):
+        self.root = Path(root).resolve()
+        self.path = self.root / CACHE_DIR_NAME / f"{name}.json"
+        self.version = version
+        self.enabled = enabled
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.derived: Dict[str, Any] = {}
+        self._seen: set = set()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if enabled:
+            self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if data.get('version') != self.version:
+            return
+        self.files = data.get('files', {})
+        self.derived = data.get('derived', {})
+
+    def relative(self, path: Path) -> str:
+        try:
+            return str(path.relative_to(self.root))
+        except ValueError:
+            return str(path)
+
+    def lookup(self, path: Path):
+        """
+        Return (key, entry_or_None, stat, valid) for path. Only stats the
+        file: the entry is valid when its size and mtime still match; anything
+        else has to be read and hashed (see map).
+        """
+        key = self.relative(path)
+        self._seen.add(key)
+        st = path.stat()
+        entry = self.files.get(key)
+        valid = entry is not None and entry['size'] == st.st_size and entry['mtime'] == st.st_mtime_ns
+        return key, entry, st, valid
+
+    def store(self, key: str, st: os.stat_result, sha: str, result: Any):
+        self.files[key] = {
+            'sha': sha,
+            'size': st.st_size,
+            'mtime': st.st_mtime_ns,
+            'data': result,
+        }
+        self._dirty = True
+
+    def get(self, path: Path, extractor: Callable[[str], Any]) -> Any:
+        """Cached extractor(text) for path."""
+        return self.map([path], extractor, workers=1)[path]
+
+    def map(self, paths: Iterable[Path], extractor: Callable[[str], Any],
+            workers: Optional[int] = None) -> Dict[Path, Any]:
+        """
+        Cached extractor(text) for every path.
+
+        Files whose stat no longer matches are read, hashed and extracted on a
+        process pool (`workers` processes, default os.cpu_count()); the parent
+        only stats. `extractor` must be a module-level function. Pass
+        workers=1 to stay in-process.
+        """
+        results: Dict[Path, Any] = {}
+        pending = []
+        for path in paths:
+            key, entry, st, valid = self.lookup(path)
+            if valid:
+                self.hits += 1
+                results[path] = entry['data']
+            else:
+                pending.append((path, key, st, entry))
+
+        known = [entry['sha'] if entry else None for _, _, _, entry in pending]
+        if workers != 1 and len(pending) >= PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                outputs = list(pool.map(_read_and_extract, [extractor] * len(pending),
+                                        [item[0] for item in pending], known, chunksize=16))
+        else:
+            outputs = [_read_and_extract(extractor, item[0], sha) for item, sha in zip(pending, known)]
+
+        for (path, key, st, entry), (digest, result) in zip(pending, outputs):
+            if entry is not None and entry['sha'] == digest:
+                # Touched but unchanged: refresh the stat fields only
+                self.hits += 1
+                entry['size'], entry['mtime'] = st.st_size, st.st_mtime_ns
+                self._dirty = True
+                result = entry['data']
+            else:
+                self.misses += 1
+                self.store(key, st, digest, result)
+            results[path] = result
+        return results
+
+    def fingerprint(self, keys: Optional[Iterable[str]] = None) -> str:
+        """Combined hash of the cached files (all seen files by default)."""
+        keys = sorted(self._seen if keys is None else keys)
+        combined = hashlib.sha1()
+        for key in keys:
+            entry = self.files.get(key)
+            combined.update(key.encode('utf-8'))
+            combined.update((entry['sha'] if entry else '-').encode('ascii'))
+        return combined.hexdigest()
+
+    def get_derived(self, name: str, fingerprint: str, builder: Callable[[], Any]) -> Any:
+        """Cached builder() result, reused while the source fingerprint is unchanged."""
+        entry = self.derived.get(name)
+        if entry and entry['fingerprint'] == fingerprint:
+            return entry['data']
+        result = builder()
+        self.derived[name] = {'fingerprint': fingerprint, 'data': result}
+        self._dirty = True
+        return result
+
+    def save(self):
+        """Write the cache, dropping entries for files not seen this run."""
+        if not self.enabled:
+            return
+        stale = set(self.files) - self._seen
+        for key in stale:
+            del self.files[key]
+        if not (self._dirty or stale):
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'version': self.version, 'files': self.files,
+                                   'derived': self.derived}), encoding='utf-8')
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+def iter_source_files(directory: Path, suffixes: Iterable[str],
+                      exclude: Iterable[str] = ('node_modules',),
+                      exclude_suffixes: Iterable[str] = ()) -> List[Path]:
+    """Source files under directory, skipping excluded and hidden directories."""
+    suffixes = tuple(suffixes)
+    exclude_suffixes = tuple(exclude_suffixes)
+    exclude = set(exclude)
+    found = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = sorted(d for d in dirnames if d not in exclude and not d.startswith('.'))
+        for filename in sorted(filenames):
+            if filename.endswith(suffixes) and not (exclude_suffixes and filename.endswith(exclude_suffixes)):
+                found.append(Path(dirpath) / filename)
+    return found
@@ -0,0 +1,140 @@
+"""In-process protocol tests for doc_link_server, driven through dispatch()."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from doc_link_server import DocLinkServer, TextDocument, path_to_uri
+
+
+def read_messages(stream: io.BytesIO):
+    """Decode every Content-Length framed message written to stream."""
+    data, messages = stream.getvalue(), []
+    while data:
+        header, _, rest = data.partition(b"\r\n\r\n")
+        length = int(header.split(b":")[1])
+        messages.append(json.loads(rest[:length]))
+        data = rest[length:]
+    stream.seek(0)
+    stream.truncate()
+    return messages
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "docs" / "how-to").mkdir(parents=True)
+    (tmp_path / "docs" / "how-to" / "DEPLOY.md").write_text("# Deploy\n\n## Roll Back\n", encoding="utf-8")
+    (tmp_path / "docs" / "GUIDE.md").write_text("# Guide\n", encoding="utf-8")
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "DEPLOY.md").write_text("# Vendored\n", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def server(workspace):
+    out = io.BytesIO()
+    server = DocLinkServer(workspace, stdin=io.BytesIO(), stdout=out)
+    server.dispatch({"id": 1, "method": "initialize", "params": {
+        "rootUri": path_to_uri(workspace),
+        "capabilities": {"workspace": {"didChangeWatchedFiles": {"dynamicRegistration": True}}},
+    }})
+    server.dispatch({"method": "initialized", "params": {}})
+    server.out = out
+    return server
+
+
+def open_doc(server, path: Path, text: str):
+    server.dispatch({"method": "textDocument/didOpen", "params": {"textDocument": {
+        "uri": path_to_uri(path), "languageId": "markdown", "version": 1, "text": text}}})
+    return read_messages(server.out)[-1]["params"]["diagnostics"]
+
+
+def test_initialize_registers_watcher_and_ignores_response(server):
+    messages = read_messages(server.out)
+    assert messages[0]["result"]["capabilities"]["definitionProvider"] is True
+    registration = messages[1]
+    assert registration["method"] == "client/registerCapability"
+    assert registration["params"]["registrations"][0]["registerOptions"] == {
+        "watchers": [{"globPattern": "**/*.md"}]}
+
+    # The client's reply is a response, not a request: no error goes back
+    server.dispatch({"id": registration["id"], "result": None})
+    assert read_messages(server.out) == []
+    assert server.pending_requests == {}
+
+
+def test_index_prunes_node_modules(server, workspace):
+    assert server.index.by_name["DEPLOY.md"] == [workspace / "docs" / "how-to" / "DEPLOY.md"]
+
+
+def test_diagnostics_follow_did_change(server, workspace):
+    path = workspace / "docs" / "INDEX.md"
+    diagnostics = open_doc(server, path, "[a](GUIDE.md) [b](DEPLOY.md) [c](GUIDE.md#nope)\n")
+    assert [d["code"] for d in diagnostics] == ["broken-link", "missing-anchor"]
+    assert diagnostics[0]["range"] == {"start": {"line": 0, "character": 18},
+                                       "end": {"line": 0, "character": 27}}
+
+    server.dispatch({"method": "textDocument/didChange", "params": {
+        "textDocument": {"uri": path_to_uri(path), "version": 2},
+        "contentChanges": [{"range": {"start": {"line": 0, "character": 18},
+                                      "end": {"line": 0, "character": 18}},
+                            "text": "how-to/"}]}})
+    diagnostics = read_messages(server.out)[-1]["params"]["diagnostics"]
+    assert [d["code"] for d in diagnostics] == ["missing-anchor"]
+
+
+def test_missing_targets_cached_until_file_event(server, workspace):
+    path = workspace / "docs" / "INDEX.md"
+    assert len(open_doc(server, path, "[n](NEW.md)\n")) == 1
+    new = workspace / "docs" / "NEW.md"
+    new.write_text("# New\n", encoding="utf-8")
+
+    # No event yet: the cached negative result stands
+    assert not server.index.exists(new)
+    server.dispatch({"method": "workspace/didChangeWatchedFiles", "params": {
+        "changes": [{"uri": path_to_uri(new), "type": 1}]}})
+    assert read_messages(server.out)[-1]["params"]["diagnostics"] == []
+
+
+def test_completion_and_code_action(server, workspace):
+    path = workspace / "docs" / "INDEX.md"
+    uri = path_to_uri(path)
+    open_doc(server, path, "[a](how-to/DEPLOY.md#ro)\n[b](DEPLOY.md)\n")
+
+    server.dispatch({"id": 2, "method": "textDocument/completion", "params": {
+        "textDocument": {"uri": uri}, "position": {"line": 0, "character": 23}}})
+    items = read_messages(server.out)[0]["result"]
+    assert [item["label"] for item in items] == ["roll-back"]
+
+    server.dispatch({"id": 3, "method": "textDocument/completion", "params": {
+        "textDocument": {"uri": uri}, "position": {"line": 0, "character": 11}}})
+    assert "DEPLOY.md" in [item["label"] for item in read_messages(server.out)[0]["result"]]
+
+    server.dispatch({"id": 4, "method": "textDocument/codeAction", "params": {
+        "textDocument": {"uri": uri},
+        "range": {"start": {"line": 1, "character": 0}, "end": {"line": 1, "character": 14}},
+        "context": {"diagnostics": []}}})
+    actions = read_messages(server.out)[0]["result"]
+    assert [action["title"] for action in actions] == ["Fix link: how-to/DEPLOY.md"]
+    edit = actions[0]["edit"]["changes"][uri][0]
+    assert edit["range"]["start"] == {"line": 1, "character": 4}
+
+
+def test_unknown_request_gets_method_not_found(server):
+    read_messages(server.out)
+    server.dispatch({"id": 9, "method": "textDocument/hover", "params": {}})
+    assert read_messages(server.out)[0]["error"]["code"] == -32601
+
+
+def test_utf16_offsets():
+    # U+1F600 takes two UTF-16 code units; é takes one
+    doc = TextDocument(Path("/tmp/x.md"), "é😀[a](b.md)\nnext\n")
+    link_start = doc.text.index("[")
+    assert doc.position(link_start) == {"line": 0, "character": 3}
+    assert doc.offset({"line": 0, "character": 3}) == link_start
+    assert doc.offset({"line": 1, "character": 2}) == doc.text.index("next") + 2
+    doc.apply_change({"range": {"start": {"line": 0, "character": 3}, "end": {"line": 0, "character": 3}},
+                      "text": "!"})
+    assert doc.text.startswith("é😀![a]")
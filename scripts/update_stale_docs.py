@@ -4,67 +4,130 @@ Update Stale Documentation Script
 Automatically updates outdated documentation with current information
 """
 
-import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
+
+from check_ws_events import load_event_index, status_updates
 
 # Current version from package.json
 CURRENT_VERSION = "6.0.14"
 TODAY = datetime.now().strftime("%Y-%m-%d")
 
+
+def apply_updates(content, updates):
+    """Apply a list of updates to file content"""
+    for update in updates:
+        if update['type'] == 'derived':
+            # Updates computed from the content itself, e.g. status rewrites
+            content = apply_updates(content, update['fn'](content))
+        elif update['type'] == 'replace':
+            content = content.replace(update['old'], update['new'])
+        elif update['type'] == 'regex':
+            content = re.sub(update['pattern'], update['replacement'], content)
+        elif update['type'] == 'add_timestamp':
+            # Add or update timestamp
+            if "**Last Updated:**" in content:
+                content = re.sub(
+                    r'\*\*Last Updated:\*\* \d{4}-\d{2}-\d{2}',
+                    f'**Last Updated:** {TODAY}',
+                    content
+                )
+            else:
+                # Add after first header
+                lines = content.split('\n')
+                for i, line in enumerate(lines):
+                    if line.startswith('#'):
+                        lines.insert(i + 1, f'\n**Last Updated:** {TODAY}')
+                        break
+                content = '\n'.join(lines)
+    return content
+
+
+@dataclass(frozen=True)
+class FileResult:
+    """Outcome of updating one file"""
+    file: str
+    updates: int
+    changed: bool
+    error: Optional[str] = None
+
+
+def process_file(filepath, updates, dry_run=False):
+    """Read a file once, apply all of its updates, and write it back once"""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            original = f.read()
+
+        content = apply_updates(original, updates)
+        changed = content != original
+
+        if changed and not dry_run:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(content)
+
+        return FileResult(str(filepath), len(updates), changed)
+
+    except Exception as e:
+        return FileResult(str(filepath), len(updates), False, str(e))
+
+
 class DocumentationUpdater:
-    def __init__(self, dry_run=False):
+    """
+    Collects update rules from every group, merges them per file, then
+    processes each file exactly once on a bounded thread pool.
+    """
+
+    def __init__(self, dry_run=False, workers=None):
         self.dry_run = dry_run
-        self.changes = []
-        self.files_updated = 0
-
-    def update_file(self, filepath, updates):
-        """Apply updates to a file"""
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            original = content
-
-            for update in updates:
-                if update['type'] == 'replace':
-                    content = content.replace(update['old'], update['new'])
-                elif update['type'] == 'regex':
-                    content = re.sub(update['pattern'], update['replacement'], content)
-                elif update['type'] == 'add_timestamp':
-                    # Add or update timestamp
-                    if "**Last Updated:**" in content:
-                        content = re.sub(
-                            r'\*\*Last Updated:\*\* \d{4}-\d{2}-\d{2}',
-                            f'**Last Updated:** {TODAY}',
-                            content
-                        )
-                    else:
-                        # Add after first header
-                        lines = content.split('\n')
-                        for i, line in enumerate(lines):
-                            if line.startswith('#'):
-                                lines.insert(i + 1, f'\n**Last Updated:** {TODAY}')
-                                break
-                        content = '\n'.join(lines)
-
-            if content != original:
-                if not self.dry_run:
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        f.write(content)
-
-                self.files_updated += 1
-                self.changes.append({
-                    'file': filepath,
-                    'updates': len(updates)
-                })
-                return True
-            return False
-
-        except Exception as e:
-            print(f"❌ Error updating {filepath}: {e}")
-            return False
+        self.workers = workers
+        # file -> updates from every group, in queue order
+        self.pending = {}
+        self.results = ()
+
+    def queue(self, items):
+        """Merge each item's updates into the per-file plan"""
+        for item in items:
+            filepath = item['file']
+            if not Path(filepath).exists():
+                print(f"  ⚠️  File not found: {filepath}")
+                continue
+            self.pending.setdefault(filepath, []).extend(item['updates'])
+            print(f"  📋 Queued {filepath}")
+
+    def run(self):
+        """Apply all queued updates, one read and one write per file"""
+        jobs = []
+        for filepath, updates in self.pending.items():
+            # Every group asks for a timestamp; it only needs to happen once, last
+            merged = [u for u in updates if u['type'] != 'add_timestamp']
+            if len(merged) != len(updates):
+                merged.append({'type': 'add_timestamp'})
+            jobs.append((Path(filepath), merged))
+        self.pending = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(process_file, path, updates, self.dry_run)
+                       for path, updates in jobs]
+            self.results = tuple(future.result() for future in futures)
+
+        for result in self.results:
+            if result.error:
+                print(f"❌ Error updating {result.file}: {result.error}")
+            elif result.changed:
+                print(f"  ✅ Updated {result.file}")
+        return self.results
+
+    @property
+    def changes(self):
+        return [{'file': r.file, 'updates': r.updates} for r in self.results if r.changed]
+
+    @property
+    def files_updated(self):
+        return len(self.changes)
 
     def fix_versions(self):
         """Fix all version mismatches"""
@@ -105,13 +168,7 @@ class DocumentationUpdater:
         ]
 
         print("📝 Fixing version numbers...")
-        for item in version_updates:
-            filepath = Path(item['file'])
-            if filepath.exists():
-                if self.update_file(filepath, item['updates']):
-                    print(f"  ✅ Updated {item['file']}")
-            else:
-                print(f"  ⚠️  File not found: {item['file']}")
+        self.queue(version_updates)
 
     def fix_api_paths(self):
         """Fix incorrect API paths"""
@@ -140,13 +197,7 @@ class DocumentationUpdater:
         ]
 
         print("🔗 Fixing API paths...")
-        for item in api_updates:
-            filepath = Path(item['file'])
-            if filepath.exists():
-                if self.update_file(filepath, item['updates']):
-                    print(f"  ✅ Updated {item['file']}")
-            else:
-                print(f"  ⚠️  File not found: {item['file']}")
+        self.queue(api_updates)
 
     def fix_security_issues(self):
         """Fix security-related documentation issues"""
@@ -168,43 +219,28 @@ class DocumentationUpdater:
         ]
 
         print("🔒 Fixing security issues...")
-        for item in security_updates:
-            filepath = Path(item['file'])
-            if filepath.exists():
-                if self.update_file(filepath, item['updates']):
-                    print(f"  ✅ Updated {item['file']}")
-            else:
-                print(f"  ⚠️  File not found: {item['file']}")
+        self.queue(security_updates)
 
     def update_feature_status(self):
         """Update feature status to reflect reality"""
+        # Derive each event's status from what the server emits and the
+        # client subscribes to, instead of hard-coding "(working)" rewrites.
+        # The rewrites are computed from the same read process_file does.
+        event_index = load_event_index(Path('.'), use_cache=not self.dry_run)
+
         feature_updates = [
             {
                 'file': 'docs/reference/api/WEBSOCKET_EVENTS.md',
                 'updates': [
-                    # Mark notifications as planned, not implemented
-                    {'type': 'replace',
-                     'old': 'kitchen_notification (working)',
-                     'new': 'kitchen_notification (PLANNED - Phase 3)'},
-                    {'type': 'replace',
-                     'old': 'customer_notification (working)',
-                     'new': 'customer_notification (PLANNED - Phase 3)'},
-                    {'type': 'replace',
-                     'old': 'refund_notification (working)',
-                     'new': 'refund_notification (PLANNED - Phase 3)'},
+                    {'type': 'derived',
+                     'fn': lambda text: status_updates(text, event_index)},
                     {'type': 'add_timestamp'}
                 ]
             }
         ]
 
         print("✨ Updating feature status...")
-        for item in feature_updates:
-            filepath = Path(item['file'])
-            if filepath.exists():
-                if self.update_file(filepath, item['updates']):
-                    print(f"  ✅ Updated {item['file']}")
-            else:
-                print(f"  ⚠️  File not found: {item['file']}")
+        self.queue(feature_updates)
 
     def add_auth_evolution_notes(self):
         """Add notes about authentication evolution"""
@@ -232,13 +268,7 @@ See [ADR-011: Authentication Evolution](../architecture-decisions/ADR-011-authen
         ]
 
         print("🔐 Adding authentication evolution notes...")
-        for item in auth_updates:
-            filepath = Path(item['file'])
-            if filepath.exists():
-                if self.update_file(filepath, item['updates']):
-                    print(f"  ✅ Updated {item['file']}")
-            else:
-                print(f"  ⚠️  File not found: {item['file']}")
+        self.queue(auth_updates)
 
     def generate_report(self):
         """Generate update report"""
@@ -278,21 +308,27 @@ def main():
     parser = argparse.ArgumentParser(description='Update stale documentation')
     parser.add_argument('--dry-run', action='store_true',
                        help='Show what would be updated without making changes')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Maximum files processed in parallel (default: Python thread pool default)')
     args = parser.parse_args()
 
-    updater = DocumentationUpdater(dry_run=args.dry_run)
+    updater = DocumentationUpdater(dry_run=args.dry_run, workers=args.workers)
 
     print("🔄 Starting documentation update...")
     print(f"Mode: {'DRY RUN' if args.dry_run else 'LIVE UPDATE'}")
     print()
 
-    # Run all updates
+    # Collect all updates, merged per file
     updater.fix_versions()
     updater.fix_api_paths()
     updater.fix_security_issues()
     updater.update_feature_status()
     updater.add_auth_evolution_notes()
 
+    # Read and write each file once
+    print("\n🚀 Applying updates...")
+    updater.run()
+
     # Generate report
     report = updater.generate_report()
     print(report)
@@ -2,31 +2,138 @@
 """
 Link Validation Script - Phase 3
 Validates that all internal links in markdown files are working.
+
+Can also be imported and used in-process:
+
+    from validate_links import check_links
+    report = check_links(root, paths=None)
+
+`LinkChecker` keeps a warm corpus (file list and target-existence cache) so
+repeated checks in one process do not rescan the tree. No module-level state
+is mutated, so checks are safe to run more than once per interpreter.
+
+With `--mmap` each file is memory-mapped and scanned with a bytes pattern;
+only the matched link spans are decoded. Files that are not valid UTF-8 are
+still checked and reported as diagnostics instead of being skipped.
+
+Broken links are stored as `LinkRecord`s of interned text/url ids (see
+link_records.py); `BrokenLink` objects are decoded only when asked for.
 """
 
+import mmap
 import os
 import re
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Tuple
-from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
 
-BASE_DIR = Path("/Users/mikeyoung/CODING/rebuild-6.0")
+from link_records import LinkRecord, LinkTables
+
+BASE_DIR = Path(__file__).resolve().parent.parent
 DOCS_DIR = BASE_DIR / "docs"
 
-stats = {
-    "total_files": 0,
-    "total_links": 0,
-    "valid_links": 0,
-    "broken_links": 0
-}
+LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+LINK_BYTES_PATTERN = re.compile(rb'\[([^\]]+)\]\(([^)]+)\)')
+EXTERNAL_PREFIXES = (b'http://', b'https://')
+
+# Bytes validated per step when checking a mapped file for invalid UTF-8
+UTF8_CHECK_CHUNK = 1 << 20
+
+
+@dataclass(frozen=True)
+class BrokenLink:
+    """A link whose target does not exist."""
+    file: str
+    link_text: str
+    link_url: str
+
+
+@dataclass(slots=True)
+class FileResult:
+    """Link statistics for a single markdown file."""
+    path_id: int
+    tables: LinkTables = field(repr=False)
+    links: int = 0
+    valid: int = 0
+    broken_records: List[LinkRecord] = field(default_factory=list)
+    diagnostics: List[str] = field(default_factory=list)
+
+    @property
+    def file(self) -> str:
+        return self.tables.paths[self.path_id]
+
+    @property
+    def broken(self) -> int:
+        return len(self.broken_records)
+
+    @property
+    def broken_list(self) -> List[BrokenLink]:
+        file, texts, urls = self.file, self.tables.texts, self.tables.urls
+        return [BrokenLink(file, texts[r.text], urls[r.url]) for r in self.broken_records]
+
+
+@dataclass
+class Report:
+    """Aggregated result of a link check."""
+    root: Path
+    files: List[FileResult] = field(default_factory=list)
+
+    @property
+    def total_files(self) -> int:
+        return len(self.files)
 
-broken_links = []
+    @property
+    def total_links(self) -> int:
+        return sum(f.links for f in self.files)
+
+    @property
+    def valid_links(self) -> int:
+        return sum(f.valid for f in self.files)
+
+    @property
+    def broken_count(self) -> int:
+        return sum(f.broken for f in self.files)
+
+    @property
+    def broken_links(self) -> List[BrokenLink]:
+        return [link for f in self.files for link in f.broken_list]
+
+    @property
+    def health(self) -> Optional[float]:
+        """Percentage of valid links, or None when no links were found."""
+        if self.total_links == 0:
+            return None
+        return (self.valid_links / self.total_links) * 100
+
+    @property
+    def diagnostics(self) -> List[Tuple[str, str]]:
+        """(file, message) for files that could not be fully read or decoded."""
+        return [(f.file, message) for f in self.files for message in f.diagnostics]
+
+    @property
+    def ok(self) -> bool:
+        """No broken links, and every file was fully read and decoded."""
+        return all(f.broken == 0 and not f.diagnostics for f in self.files)
+
+
+@dataclass(frozen=True)
+class ScannedLink:
+    """An internal link found by the byte scanner; start/end are byte offsets of the match."""
+    start: int
+    end: int
+    link_text: str
+    link_url: str
+
+
+@dataclass
+class ScanResult:
+    links: List[ScannedLink] = field(default_factory=list)
+    diagnostics: List[str] = field(default_factory=list)
 
 
 def extract_markdown_links(content: str) -> List[Tuple[str, str]]:
     """Extract markdown links. Returns: List of (link_text, link_url) tuples"""
-    pattern = r'\[([^\]]+)\]\(([^)]+)\)'
-    matches = re.finditer(pattern, content)
+    matches = LINK_PATTERN.finditer(content)
 
     links = []
     for match in matches:
@@ -43,6 +150,72 @@ def extract_markdown_links(content: str) -> List[Tuple[str, str]]:
     return links
 
 
+def find_invalid_utf8(buf, chunk_size: int = UTF8_CHECK_CHUNK) -> Optional[int]:
+    """Byte offset of the first invalid UTF-8 sequence in buf, or None."""
+    pos, size = 0, len(buf)
+    while pos < size:
+        chunk = buf[pos:pos + chunk_size]
+        if chunk.isascii():
+            pos += len(chunk)
+            continue
+        try:
+            chunk.decode('utf-8')
+        except UnicodeDecodeError as e:
+            # A multi-byte character split by the chunk boundary is not an error
+            if e.reason == 'unexpected end of data' and pos + len(chunk) < size and e.start > 0:
+                pos += e.start
+                continue
+            return pos + e.start
+        pos += len(chunk)
+    return None
+
+
+def line_at(buf, offset: int, chunk_size: int = UTF8_CHECK_CHUNK) -> int:
+    """1-based line of offset; counts newlines chunk by chunk instead of copying buf[:offset]."""
+    line, pos = 1, 0
+    while pos < offset:
+        end = min(pos + chunk_size, offset)
+        line += buf[pos:end].count(b'\n')
+        pos = end
+    return line
+
+
+def scan_markdown_links(file_path: Path) -> ScanResult:
+    """
+    Extract internal markdown links from a memory-mapped file.
+
+    The bytes pattern runs directly on the mapping and only the matched
+    text/url spans are decoded, so the file is never held as a str. Invalid
+    UTF-8 is reported in `diagnostics`; links that are themselves undecodable
+    are skipped with a diagnostic.
+    """
+    result = ScanResult()
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return result
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            bad = find_invalid_utf8(buf)
+            if bad is not None:
+                result.diagnostics.append(f"invalid UTF-8 at byte {bad} (line {line_at(buf, bad)})")
+
+            for match in LINK_BYTES_PATTERN.finditer(buf):
+                raw_url = match.group(2)
+                # Only internal markdown links, skipping anchor-only ones
+                if raw_url.startswith(EXTERNAL_PREFIXES) or b'.md' not in raw_url:
+                    continue
+                if not raw_url.split(b'#')[0]:
+                    continue
+                try:
+                    link_text = match.group(1).decode('utf-8')
+                    link_url = raw_url.decode('utf-8')
+                except UnicodeDecodeError:
+                    result.diagnostics.append(
+                        f"undecodable link at line {line_at(buf, match.start())} skipped")
+                    continue
+                result.links.append(ScannedLink(match.start(), match.end(), link_text, link_url))
+    return result
+
+
 def validate_link(source_file: Path, link_url: str) -> bool:
     """Validate that a relative link exists"""
     # Remove anchor
@@ -55,108 +228,151 @@ def validate_link(source_file: Path, link_url: str) -> bool:
     return target.exists()
 
 
-def validate_file(file_path: Path) -> Dict:
-    """Validate all links in a file"""
-    file_stats = {
-        "links": 0,
-        "valid": 0,
-        "broken": 0,
-        "broken_list": []
-    }
-
+def is_ignored(path: Path, root: Path) -> bool:
+    """Skip node_modules and hidden directories below root."""
     try:
-        content = file_path.read_text(encoding='utf-8')
-    except Exception as e:
-        return file_stats
-
-    links = extract_markdown_links(content)
-    file_stats["links"] = len(links)
-
-    for link_text, link_url in links:
-        if validate_link(file_path, link_url):
-            file_stats["valid"] += 1
-        else:
-            file_stats["broken"] += 1
-            file_stats["broken_list"].append((link_text, link_url))
-            broken_links.append({
-                "file": str(file_path.relative_to(BASE_DIR)),
-                "link_text": link_text,
-                "link_url": link_url
-            })
-
-    return file_stats
+        parts = path.relative_to(root).parts
+    except ValueError:
+        parts = path.parts
+    return 'node_modules' in parts or any(part.startswith('.') for part in parts[:-1])
 
 
-def main():
-    """Main validation function"""
-    print("=" * 80)
-    print("Link Validation - Phase 3")
-    print("Validating all internal markdown links")
-    print("=" * 80)
-
-    # Find all markdown files
+def find_markdown_files(root: Path) -> List[Path]:
+    """Find markdown files under root/docs plus the root-level markdown files."""
+    docs_dir = root / "docs"
     md_files = []
     for ext in ['*.md', '*.MD']:
-        md_files.extend(DOCS_DIR.rglob(ext))
-        md_files.extend(BASE_DIR.glob(ext))
+        md_files.extend(docs_dir.rglob(ext))
+        md_files.extend(root.glob(ext))
 
     # Remove duplicates and filter
-    md_files = list(set(md_files))
-    md_files = [f for f in md_files if 'node_modules' not in f.parts
-                and not any(part.startswith('.') for part in f.parts[:-1])]
-    md_files.sort()
-
-    stats["total_files"] = len(md_files)
-    print(f"Found {len(md_files)} markdown files to validate\n")
-
-    files_with_broken_links = []
-
-    for i, md_file in enumerate(md_files, 1):
-        rel_path = md_file.relative_to(BASE_DIR)
-        print(f"\r[{i}/{len(md_files)}] Validating {rel_path}...", end='', flush=True)
+    md_files = sorted({f for f in md_files if not is_ignored(f, root)})
+    return md_files
+
+
+class LinkChecker:
+    """
+    Reentrant link checker bound to a single root.
+
+    The markdown file list and link-target existence lookups are cached on
+    the instance; call `invalidate()` after the tree changes on disk. Paths,
+    link texts and urls are interned in `tables` for the checker's lifetime.
+    """
+
+    def __init__(self, root: Path = BASE_DIR, use_mmap: bool = False):
+        self.root = Path(root).resolve()
+        self.use_mmap = use_mmap
+        self._files: Optional[List[Path]] = None
+        self._exists: Dict[Path, bool] = {}
+        self.tables = LinkTables()
+
+    @property
+    def files(self) -> List[Path]:
+        if self._files is None:
+            self._files = find_markdown_files(self.root)
+        return self._files
+
+    def invalidate(self):
+        """Drop cached corpus state."""
+        self._files = None
+        self._exists.clear()
+
+    def relative(self, path: Path) -> str:
+        try:
+            return str(path.relative_to(self.root))
+        except ValueError:
+            return str(path)
+
+    def target_exists(self, source_file: Path, link_url: str) -> bool:
+        clean_url = link_url.split('#')[0]
+        target = (source_file.parent / clean_url).resolve()
+        exists = self._exists.get(target)
+        if exists is None:
+            exists = self._exists[target] = target.exists()
+        return exists
+
+    def check_file(self, file_path: Path) -> FileResult:
+        """Validate all links in a file; a relative path is taken relative to the root."""
+        file_path = (self.root / file_path).resolve()
+        tables = self.tables
+        result = FileResult(tables.paths.intern(self.relative(file_path)), tables)
+
+        try:
+            if self.use_mmap:
+                scan = scan_markdown_links(file_path)
+                result.diagnostics.extend(scan.diagnostics)
+                links = [(link.link_text, link.link_url) for link in scan.links]
+            else:
+                links = extract_markdown_links(file_path.read_text(encoding='utf-8'))
+        except UnicodeDecodeError as e:
+            result.diagnostics.append(f"invalid UTF-8 at byte {e.start}; file not checked (try --mmap)")
+            return result
+        except OSError as e:
+            result.diagnostics.append(f"could not read file: {e}")
+            return result
+
+        result.links = len(links)
+
+        for link_text, link_url in links:
+            if self.target_exists(file_path, link_url):
+                result.valid += 1
+            else:
+                result.broken_records.append(LinkRecord(tables.texts.intern(link_text),
+                                                        tables.urls.intern(link_url)))
+
+        return result
+
+    def check(self, paths: Optional[Iterable[Path]] = None) -> Report:
+        """Check the given files, or the whole corpus when paths is None."""
+        if paths is None:
+            targets = self.files
+        else:
+            targets = sorted((self.root / p).resolve() for p in paths)
+        return Report(root=self.root, files=[self.check_file(p) for p in targets])
 
-        file_stats = validate_file(md_file)
-        stats["total_links"] += file_stats["links"]
-        stats["valid_links"] += file_stats["valid"]
-        stats["broken_links"] += file_stats["broken"]
 
-        if file_stats["broken"] > 0:
-            files_with_broken_links.append({
-                "file": str(rel_path),
-                "broken_count": file_stats["broken"],
-                "broken_links": file_stats["broken_list"]
-            })
+def check_links(root: Path = BASE_DIR, paths: Optional[Iterable[Path]] = None,
+                use_mmap: bool = False) -> Report:
+    """Check internal markdown links under root (or only the given paths)."""
+    return LinkChecker(root, use_mmap=use_mmap).check(paths)
 
-    print("\n")
 
-    # Print summary
+def print_summary(report: Report) -> int:
+    """Print the validation summary. Returns the process exit code."""
     print("=" * 80)
     print("VALIDATION SUMMARY")
     print("=" * 80)
-    print(f"Files scanned:       {stats['total_files']}")
-    print(f"Total links:         {stats['total_links']}")
-    print(f"Valid links:         {stats['valid_links']}")
-    print(f"Broken links:        {stats['broken_links']}")
+    print(f"Files scanned:       {report.total_files}")
+    print(f"Total links:         {report.total_links}")
+    print(f"Valid links:         {report.valid_links}")
+    print(f"Broken links:        {report.broken_count}")
 
-    if stats['total_links'] > 0:
-        health_rate = (stats['valid_links'] / stats['total_links']) * 100
-        print(f"Link health:         {health_rate:.1f}%")
+    if report.health is not None:
+        print(f"Link health:         {report.health:.1f}%")
 
     print("=" * 80)
 
-    if stats['broken_links'] > 0:
-        print(f"\nWARNING: {stats['broken_links']} broken links found")
+    diagnostics = report.diagnostics
+    if diagnostics:
+        print(f"\nWARNING: {len(diagnostics)} read diagnostics")
+        for file_path, message in diagnostics:
+            print(f"   {file_path}: {message}")
+
+    files_with_broken_links = [f for f in report.files if f.broken > 0]
+
+    if files_with_broken_links:
+        print(f"\nWARNING: {report.broken_count} broken links found")
         print(f"Files affected: {len(files_with_broken_links)}")
 
         print("\nTop 20 files with broken links:")
         for i, file_info in enumerate(sorted(files_with_broken_links,
-                                             key=lambda x: x['broken_count'],
+                                             key=lambda x: x.broken,
                                              reverse=True)[:20], 1):
-            print(f"{i}. {file_info['file']} - {file_info['broken_count']} broken links")
-            for link_text, link_url in file_info['broken_links'][:5]:
-                print(f"   - {link_url}")
-            if len(file_info['broken_links']) > 5:
-                print(f"   - ... and {len(file_info['broken_links']) - 5} more")
+            print(f"{i}. {file_info.file} - {file_info.broken} broken links")
+            for link in file_info.broken_list[:5]:
+                print(f"   - {link.link_url}")
+            if file_info.broken > 5:
+                print(f"   - ... and {file_info.broken - 5} more")
 
         return 1
     else:
@@ -164,5 +380,41 @@ def main():
         return 0
 
 
+def main():
+    """Main validation function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Validate internal markdown links')
+    parser.add_argument('--root', type=Path, default=BASE_DIR, help='Repository root to scan')
+    parser.add_argument('--mmap', action='store_true',
+                        help='Scan memory-mapped bytes, decoding only matched links')
+    parser.add_argument('--history', type=Path, default=None, metavar='DB',
+                        help='Append this run to a SQLite link history (see link_history.py)')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("Link Validation - Phase 3")
+    print("Validating all internal markdown links")
+    print("=" * 80)
+
+    checker = LinkChecker(args.root, use_mmap=args.mmap)
+    md_files = checker.files
+    print(f"Found {len(md_files)} markdown files to validate\n")
+
+    report = Report(root=checker.root)
+    for i, md_file in enumerate(md_files, 1):
+        print(f"\r[{i}/{len(md_files)}] Validating {checker.relative(md_file)}...", end='', flush=True)
+        report.files.append(checker.check_file(md_file))
+
+    print("\n")
+
+    if args.history:
+        from link_history import record_report
+        run_id = record_report(args.history, report)
+        print(f"Recorded run {run_id} in {args.history}")
+
+    return print_summary(report)
+
+
 if __name__ == '__main__':
     exit(main())